@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for name-cleaver. These aren't installed with the
+package; run them from a checkout, e.g. `python -m benchmarks.run`.
+"""
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Generators of benchmark inputs, shaped like the names found in campaign
+finance and lobbying data. Every generator takes a count and a seed and
+returns the same list for the same arguments, so runs can be compared.
+
+The "realistic" corpora draw real-looking name parts and combine them in the
+shapes (and roughly the proportions) seen in FEC and CRP records; the
+"synthetic" ones use random letter strings in the same shapes, so that
+nothing is helped along by repeated tokens.
+"""
+import random
+import string
+
+FIRST_NAMES = ['John', 'Mary', 'Robert', 'Patricia', 'James', 'Linda', 'Michael', 'Barbara', 'William',
+    'Elizabeth', 'David', 'Jennifer', 'Richard', 'Susan', 'Charles', 'Margaret', 'Joseph', 'Dorothy',
+    'Thomas', 'Nancy', 'Christopher', 'Karen', 'Daniel', 'Betty', 'Paul', 'Helen', 'Mark', 'Sandra',
+    'Donald', 'Kathy', 'Bob', 'Jim', 'Bill', 'Liz', 'Drew', 'Van', 'C.', 'T', 'BL', 'Sean', u'Renée']
+MIDDLE_NAMES = ['A', 'B', 'C', 'D', 'E', 'J', 'L', 'M', 'R', 'T', 'W', 'J.', 'M.', 'Lee', 'Ann', 'Marie',
+    'Boone', 'Swift Eagle', 'de L\'Isle']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Miller', 'Davis', 'Garcia', 'Wilson',
+    'Anderson', 'Taylor', 'Thomas', 'Moore', 'Martin', 'Jackson', 'Thompson', 'White', 'Harris',
+    'Pelosi', 'McDonald', 'MacDonald', 'O\'Donnell', 'O\'Leary', 'De Kuyper', 'Di Souza', 'La Mere',
+    'Van Buren', 'Cuccinelli', 'Ruppersberger', 'Schwartz', 'Pickens', u'Fünke', 'Jones-Smith']
+HONORIFICS = ['Mr', 'Mr.', 'Mrs', 'Mrs.', 'Ms', 'Dr', 'Dr.']
+SUFFIXES = ['Jr', 'Jr.', 'Sr', 'II', 'III', 'IV', 'MD', 'M.D.', 'PhD']
+NICKNAMES = ['"Bob"', '"Tripp"', '"Kit"', '"Dutch"', '(Bob)', '(Jimmy)']
+PARTIES = ['(R)', '(D)', '(I)', '(3)', '(COMMITTEE 1)']
+
+ORGANIZATION_WORDS = ['Raytheon', 'Lockheed', 'Martin', 'Boeing', 'Merck', 'General', 'Electric', 'Health',
+    'Net', 'Machinists', 'Aerospace', 'Workers', 'Distilled', 'Spirits', 'Council', 'Phoenix', 'Women\'s',
+    'Massachusetts', 'Technology', 'Walsh', 'McDonnell', 'Douglas', 'Pacific', 'Trust', 'Leadership',
+    'Business', 'Roundtable', 'Teachers', 'Bankers', 'Realtors', 'Home', 'Builders']
+ORGANIZATION_FILLERS = ['The', 'of', 'and', 'for', 'Group', 'National', 'Natl', 'Intl', 'American', 'Amer',
+    'Assn', 'Association', 'Cmte', 'Inst', 'Univ', 'US', 'United States']
+ORGANIZATION_ENDINGS = ['Inc', 'Inc.', 'Corp', 'Corp.', 'Co', 'Co.', 'LLC', 'LLP', 'Ltd', 'PAC', 'PLC',
+    'Company', 'Corporation', 'Incorporated']
+ORGANIZATION_TAILS = ['-ILLINOIS', ' - JOFPAC', '-Tech', ' (formerly Acme)', ' (PAC', ' and its affiliates',
+    ', et al', '-123']
+
+
+def random_word(rnd, low=3, high=10):
+    return rnd.choice(string.ascii_uppercase) + ''.join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(low, high)))
+
+
+class NameParts(object):
+    """ Supplies the parts a name is built from, either from the lists above or made up on the spot. """
+
+    def __init__(self, rnd, synthetic):
+        self.rnd = rnd
+        self.synthetic = synthetic
+
+    def pick(self, choices, low=3, high=10):
+        if self.synthetic:
+            return random_word(self.rnd, low, high)
+        return self.rnd.choice(choices)
+
+    def first(self):
+        return self.pick(FIRST_NAMES)
+
+    def middle(self):
+        if self.synthetic:
+            return self.rnd.choice(string.ascii_uppercase)
+        return self.rnd.choice(MIDDLE_NAMES)
+
+    def last(self):
+        return self.pick(LAST_NAMES, 4, 12)
+
+    def organization_word(self):
+        return self.pick(ORGANIZATION_WORDS, 4, 12)
+
+
+def recase(rnd, name):
+    """ Most campaign finance data is upper case; some is lower. """
+    roll = rnd.random()
+    if roll < 0.6:
+        return name.upper()
+    elif roll < 0.65:
+        return name.lower()
+    return name
+
+
+def individual_name(parts):
+    rnd = parts.rnd
+    shape = rnd.random()
+
+    if shape < 0.35:
+        # LAST, FIRST M
+        name = u'{0}, {1} {2}'.format(parts.last(), parts.first(), parts.middle())
+    elif shape < 0.5:
+        name = u'{0} {1}'.format(parts.first(), parts.last())
+    elif shape < 0.6:
+        name = u'{0} {1} {2}'.format(parts.first(), parts.middle(), parts.last())
+    elif shape < 0.75:
+        # honorifics and suffixes, in either order
+        name = u'{0}, {1} {2} {3} {4}'.format(parts.last(), parts.first(), parts.middle(),
+                rnd.choice(HONORIFICS), rnd.choice(SUFFIXES))
+    elif shape < 0.85:
+        name = u'{0} {1} {2}, {3}'.format(rnd.choice(HONORIFICS), parts.first(), parts.last(), rnd.choice(SUFFIXES))
+    elif shape < 0.95:
+        # quoted nicknames
+        name = u'{0}, {1} {2} {3}'.format(parts.last(), parts.first(), parts.middle(), rnd.choice(NICKNAMES))
+    else:
+        # trailing junk
+        name = u'{0} {1}, {2} {3} & MRS'.format(parts.last(), rnd.randint(10, 999), parts.first(), parts.middle())
+
+    return recase(rnd, name)
+
+
+def politician_name(parts):
+    rnd = parts.rnd
+    shape = rnd.random()
+
+    if shape < 0.6:
+        # party suffixes
+        name = u'{0}, {1} {2}'.format(parts.last(), parts.first(), rnd.choice(PARTIES))
+    elif shape < 0.8:
+        name = u'{0} {1} {2} {3}'.format(parts.first(), parts.middle(), parts.last(), rnd.choice(PARTIES))
+    elif shape < 0.9:
+        name = u'{0} {1} {2}, {3}'.format(parts.first(), rnd.choice(NICKNAMES), parts.last(), rnd.choice(SUFFIXES[:6]))
+    else:
+        # running mates
+        name = u'{0}, {1} {2} {3}, {4}'.format(parts.last(), parts.first(), rnd.choice('&/'), parts.last(), parts.first())
+
+    return recase(rnd, name)
+
+
+def organization_name(parts):
+    rnd = parts.rnd
+    words = [ parts.organization_word() for _ in range(rnd.randint(1, 3)) ]
+
+    if rnd.random() < 0.4:
+        words.insert(rnd.randint(0, len(words)), rnd.choice(ORGANIZATION_FILLERS))
+    if rnd.random() < 0.6:
+        words.append(rnd.choice(ORGANIZATION_ENDINGS))
+
+    name = u' '.join(words)
+
+    if rnd.random() < 0.15:
+        # hyphenated names
+        name = name.replace(' ', '-', 1)
+    if rnd.random() < 0.2:
+        # parentheticals and other trailing phrases
+        name += rnd.choice(ORGANIZATION_TAILS)
+
+    return recase(rnd, name)
+
+
+def corpus(generate, count, seed=0, synthetic=False):
+    parts = NameParts(random.Random(seed), synthetic)
+    return [ generate(parts) for _ in xrange(count) ]
+
+
+def individual_names(count, seed=0, synthetic=False):
+    return corpus(individual_name, count, seed, synthetic)
+
+
+def politician_names(count, seed=0, synthetic=False):
+    return corpus(politician_name, count, seed, synthetic)
+
+
+def organization_names(count, seed=0, synthetic=False):
+    return corpus(organization_name, count, seed, synthetic)
@@ -0,0 +1,44 @@
+"""
+Compares two benchmark runs written by benchmarks.run:
+
+    python -m benchmarks.diff before.json after.json
+
+Prints the change in throughput and latency for each benchmark, and flags any
+benchmark whose outputs changed between the runs.
+"""
+import json
+import sys
+
+
+def load(path):
+    with open(path) as results:
+        return json.load(results)
+
+
+def ratio(before, after):
+    if not before or not after:
+        return '     n/a'
+    return '%7.2fx' % (float(after) / before)
+
+
+def main(argv=None):
+    before_path, after_path = (argv or sys.argv[1:])[:2]
+    before, after = load(before_path)['results'], load(after_path)['results']
+
+    print '%-48s %12s %12s %8s %10s %10s  %s' % ('benchmark', 'before/s', 'after/s', 'speedup', 'p50 us', 'p99 us', 'outputs')
+
+    for benchmark in sorted(set(before) | set(after)):
+        old, new = before.get(benchmark), after.get(benchmark)
+        if not old or not new:
+            print '%-48s only in %s' % (benchmark, before_path if old else after_path)
+            continue
+
+        print '%-48s %12.0f %12.0f %8s %10.1f %10.1f  %s' % (benchmark,
+                old['names_per_second'], new['names_per_second'],
+                ratio(old['names_per_second'], new['names_per_second']),
+                new['p50_us'], new['p99_us'],
+                'same' if old['checksum'] == new['checksum'] else 'CHANGED')
+
+
+if __name__ == '__main__':
+    main()
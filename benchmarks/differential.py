@@ -0,0 +1,42 @@
+"""
+Checks every cleaver against the frozen reference implementation over
+generated corpora, realistic and synthetic:
+
+    python -m benchmarks.differential --count 100000
+
+Prints each cleaver's divergences (see name_cleaver.differential) and exits
+with status 1 if there were any. To check files of real names instead, use
+python -m name_cleaver.differential.
+"""
+import argparse
+import sys
+from name_cleaver import differential
+from name_cleaver.cleaver import IndividualNameCleaver, PoliticianNameCleaver, OrganizationNameCleaver
+from benchmarks import corpora
+
+CORPORA = (
+    (IndividualNameCleaver, corpora.individual_names),
+    (PoliticianNameCleaver, corpora.politician_names),
+    (OrganizationNameCleaver, corpora.organization_names),
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=20000, help='names per corpus')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--examples', type=int, default=20, help='divergent inputs to show per corpus')
+    args = parser.parse_args(argv)
+
+    diverged = 0
+    for synthetic in (False, True):
+        for cleaver_class, generate in CORPORA:
+            report = differential.compare(cleaver_class, generate(args.count, args.seed, synthetic), args.examples)
+            print '[{0}] {1}'.format('synthetic' if synthetic else 'realistic', report.summary().encode('utf-8'))
+            diverged += report.diverged
+
+    return 1 if diverged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Compares the memory held by parsed names now that they're slotted against the
+__dict__-backed instances they used to be.
+
+    python -m benchmarks.memory [count]
+"""
+import gc
+import os
+import sys
+from name_cleaver.names import PersonName, PoliticianName, OrganizationName
+
+
+class DictBackedName(object):
+    """ Stands in for the old, unslotted classes: attributes that were set live in the instance __dict__. """
+
+
+def dict_backed(name):
+    plain = DictBackedName()
+    plain.__dict__.update((attr, value) for attr, value in name.__getstate__().iteritems() if value is not None)
+    return plain
+
+
+def rss_bytes():
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * 4096
+
+
+def footprint(obj):
+    return sys.getsizeof(obj) + (sys.getsizeof(obj.__dict__) if hasattr(obj, '__dict__') else 0)
+
+
+def person(cls, i):
+    return cls().new_from_tokens('Robert', 'J.', 'Smith%d' % i, 'Jr.')
+
+
+def organization(cls, i):
+    return cls().new('Raytheon Company %d' % i).case_name_parts()
+
+
+def growth(convert, names):
+    gc.collect()
+    before = rss_bytes()
+    copies = [ convert(x) for x in names ]
+    gc.collect()
+    return (rss_bytes() - before) / float(len(copies)), copies
+
+
+def main(count=200000):
+    print '%-18s %12s %12s %14s %14s' % ('', 'dict bytes', 'slot bytes', 'dict rss/name', 'slot rss/name')
+
+    for cls, build in ((PersonName, person), (PoliticianName, person), (OrganizationName, organization)):
+        # measure each class in a fresh process, so memory freed by the last one isn't reused
+        pid = os.fork()
+        if pid:
+            os.waitpid(pid, 0)
+            continue
+
+        names = [ build(cls, i) for i in xrange(count) ]
+        dict_rss, dict_copies = growth(dict_backed, names)
+        slot_rss, slot_copies = growth(lambda x: x.copy(), names)
+        print '%-18s %12d %12d %14.0f %14.0f' % (cls.__name__,
+                footprint(dict_copies[0]), footprint(slot_copies[0]), dict_rss, slot_rss)
+        sys.stdout.flush()
+        os._exit(0)
+
+
+if __name__ == '__main__':
+    main(*[ int(x) for x in sys.argv[1:] ])
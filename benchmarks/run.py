@@ -0,0 +1,151 @@
+"""
+Times every cleaver's parse() and compare() over generated corpora and
+writes the results as JSON:
+
+    python -m benchmarks.run --count 20000 --output before.json
+    python -m benchmarks.run --count 20000 --output after.json
+    python -m benchmarks.diff before.json after.json
+
+For each benchmark we report throughput (names per second), per-call p50
+and p99 latency in microseconds, and a checksum of the outputs, so a change
+that speeds things up by also changing results is easy to spot.
+"""
+import argparse
+import hashlib
+import json
+import platform
+import random
+import sys
+import time
+from timeit import default_timer as timer
+from name_cleaver.cleaver import IndividualNameCleaver, PoliticianNameCleaver, OrganizationNameCleaver
+from name_cleaver.index import PersonNameIndex, OrganizationNameIndex
+from benchmarks import corpora
+
+CLEAVERS = (
+    (IndividualNameCleaver, corpora.individual_names),
+    (PoliticianNameCleaver, corpora.politician_names),
+    (OrganizationNameCleaver, corpora.organization_names),
+)
+INDEXES = (
+    (IndividualNameCleaver, PersonNameIndex, corpora.individual_names),
+    (OrganizationNameCleaver, OrganizationNameIndex, corpora.organization_names),
+)
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(latencies, elapsed, outputs):
+    ordered = sorted(latencies)
+    checksum = hashlib.sha1()
+
+    for output in outputs:
+        checksum.update(repr(output))
+
+    return {
+        'count': len(latencies),
+        'names_per_second': len(latencies) / elapsed if elapsed else None,
+        'p50_us': percentile(ordered, 0.5) * 1e6,
+        'p99_us': percentile(ordered, 0.99) * 1e6,
+        'checksum': checksum.hexdigest(),
+    }
+
+
+def output_of(result):
+    return str(result) if result is not None else None
+
+
+def time_calls(function, inputs):
+    latencies = []
+    outputs = []
+    started = timer()
+
+    for args in inputs:
+        before = timer()
+        result = function(*args)
+        latencies.append(timer() - before)
+        outputs.append(result)
+
+    return latencies, timer() - started, outputs
+
+
+def bench_parse(cleaver_class, names):
+    latencies, elapsed, outputs = time_calls(lambda x: cleaver_class(x).parse(safe=True), [ (x,) for x in names ])
+    return summarize(latencies, elapsed, [ output_of(x) for x in outputs ])
+
+
+def comparison_pairs(index_class, parsed, count, seed):
+    """
+    Half the pairs are drawn at random, which mostly exercises the early
+    exits in compare(); the other half come from the same block of an index,
+    which is what compare() sees when it's used for matching.
+    """
+    rnd = random.Random(seed)
+    index = index_class(parsed)
+    blocks = [ x for x in index.blocks.values() if len(x) > 1 ]
+    pairs = []
+
+    for i in xrange(count):
+        if i % 2 and blocks:
+            block = rnd.choice(blocks)
+            pairs.append((index.names[rnd.choice(block)], index.names[rnd.choice(block)]))
+        else:
+            pairs.append((rnd.choice(index.names), rnd.choice(index.names)))
+
+    return pairs
+
+
+def bench_compare(cleaver_class, index_class, names, seed):
+    parsed = [ x for x in cleaver_class.parse_many(names) if isinstance(x, cleaver_class.object_class) ]
+    pairs = comparison_pairs(index_class, parsed, len(names), seed)
+    latencies, elapsed, outputs = time_calls(cleaver_class.compare, pairs)
+    return summarize(latencies, elapsed, outputs)
+
+
+def run(count, seed):
+    results = {}
+
+    for synthetic in (False, True):
+        corpus = 'synthetic' if synthetic else 'realistic'
+
+        for cleaver_class, generate in CLEAVERS:
+            names = generate(count, seed, synthetic)
+            results['{0}.parse/{1}'.format(cleaver_class.__name__, corpus)] = bench_parse(cleaver_class, names)
+
+        for cleaver_class, index_class, generate in INDEXES:
+            names = generate(count, seed, synthetic)
+            results['{0}.compare/{1}'.format(cleaver_class.__name__, corpus)] = bench_compare(cleaver_class, index_class, names, seed)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=10000, help='names per benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='where to write the JSON results (default: stdout)')
+    args = parser.parse_args(argv)
+
+    report = {
+        'meta': {
+            'count': args.count,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': run(args.count, args.seed),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print
+
+
+if __name__ == '__main__':
+    main()
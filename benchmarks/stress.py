@@ -0,0 +1,109 @@
+"""
+Checks that parse time stays bounded on long, junk-filled input:
+
+    python -m benchmarks.stress
+    python -m benchmarks.stress --no-limits    # how the rules themselves scale
+
+Each cleaver parses inputs built to be hard on the rules (long runs of
+spaces, unclosed parentheses, repeated honorifics and so on) at lengths
+doubling up to four times the cleavers' max_length. For each kind of input
+we report the time per parse at every length, and flag it if time per
+character grows by more than --tolerance from the shortest input to the
+longest one parsed, or if inputs over max_length or max_tokens take longer
+than the longest one under them. The exit status is 1 if anything was flagged.
+"""
+import argparse
+import sys
+from timeit import default_timer as timer
+from name_cleaver.cleaver import BaseNameCleaver, IndividualNameCleaver, PoliticianNameCleaver, OrganizationNameCleaver
+
+CLEAVERS = (IndividualNameCleaver, PoliticianNameCleaver, OrganizationNameCleaver)
+
+
+def repeated(piece, prefix='', suffix=''):
+    return lambda length: prefix + (piece * (length // len(piece) + 1))[:max(0, length - len(prefix) - len(suffix))] + suffix
+
+
+INPUTS = {
+    'spaces': repeated(' ', 'Smith', 'John!'),
+    'letters': repeated('a', '', '-b!'),
+    'open parens': repeated('(', 'Smith ', ')x'),
+    'spaced parens': repeated('( ', 'Smith '),
+    'honorifics': repeated('mr ', '', 'Smith'),
+    'numbers': repeated('12 ', '', 'Smith'),
+    'nicknames': repeated('"a" ', '', 'Smith'),
+    'suffixes': repeated('jr ', '', 'Smith'),
+    'words': repeated('Smith '),
+    'commas': repeated('Smith, '),
+    'memo field': repeated('Mr. John "Jack" Smith, Jr. (D) 1999 & mrs - formerly '),
+}
+
+
+def seconds_per_parse(cleaver_class, string, repeat):
+    best = None
+
+    for i in xrange(repeat):
+        started = timer()
+        cleaver_class(string).parse(safe=True)
+        elapsed = timer() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def lengths(limit, smallest=64):
+    length = smallest
+    while length <= 4 * limit:
+        yield length
+        length *= 2
+
+
+def stress(cleaver_class, generate, limit, repeat, tolerance):
+    """ Returns the time per parse at each length, and the reason it's flagged (or None). """
+    cleaver = cleaver_class(None)
+    times, parsed, rejected = [], [], []
+
+    for length in lengths(limit):
+        string = generate(length)
+        timing = (length, seconds_per_parse(cleaver_class, string, repeat))
+        times.append(timing)
+        (rejected if cleaver.too_long(string) else parsed).append(timing)
+
+    (shortest, shortest_time), (longest, longest_time) = parsed[0], parsed[-1]
+    growth = (longest_time / longest) / (shortest_time / shortest)
+
+    if growth > tolerance:
+        return times, 'time per character grew {0:.1f}x'.format(growth)
+    if rejected and max(x[1] for x in rejected) > longest_time:
+        return times, 'rejecting long inputs is slower than parsing short ones'
+    return times, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--no-limits', action='store_true', help='lift max_length and max_tokens')
+    parser.add_argument('--limit', type=int, default=BaseNameCleaver.max_length or 1000,
+            help='longest input to try is four times this (default: max_length)')
+    parser.add_argument('--repeat', type=int, default=5, help='parses per input; the fastest counts')
+    parser.add_argument('--tolerance', type=float, default=4.0, help='allowed growth in time per character')
+    args = parser.parse_args(argv)
+
+    if args.no_limits:
+        BaseNameCleaver.max_length = BaseNameCleaver.max_tokens = None
+
+    header = [ '%7d' % x for x in lengths(args.limit) ]
+    print '%-24s %-14s %s  (ms per parse, by input length)' % ('cleaver', 'input', ' '.join(header))
+    flagged = 0
+
+    for cleaver_class in CLEAVERS:
+        for name in sorted(INPUTS):
+            times, problem = stress(cleaver_class, INPUTS[name], args.limit, args.repeat, args.tolerance)
+            flagged += problem is not None
+            print '%-24s %-14s %s  %s' % (cleaver_class.__name__, name,
+                    ' '.join('%7.3f' % (x[1] * 1e3) for x in times), problem or '')
+
+    return 1 if flagged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
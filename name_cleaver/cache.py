@@ -0,0 +1,403 @@
+from collections import OrderedDict
+import hashlib
+import marshal
+import os
+import sqlite3
+import sys
+import threading
+from exception import UnparseableNameException
+from names import Name, PoliticalMetadata, all_slots
+
+
+class Unparseable(object):
+    """ A cached failure to parse, and why (see UnparseableNameException.reason). """
+    __slots__ = ('reason',)
+
+    def __init__(self, reason=None):
+        self.reason = reason
+
+
+class ParseCache(object):
+    """
+    A bounded, least-recently-used cache of parse results, keyed by cleaver
+    class and raw input string. It's opt-in; install it on a cleaver class, or
+    on BaseNameCleaver to cover all of them:
+
+        BaseNameCleaver.parse_cache = ParseCache(maxsize=100000)
+
+    Callers always get their own copy of a cached name, so changing it (with
+    plus_metadata, say) doesn't affect later results. Inputs that can't be
+    parsed are cached too, and fail the same way again on a hit, for the same
+    reason.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.clear()
+
+    def clear(self):
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, cleaver):
+        return (type(cleaver), type(cleaver.orig_str), cleaver.orig_str)
+
+    def parse(self, cleaver, safe=False):
+        key = self.key(cleaver)
+
+        try:
+            result = self.entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            result = self.parse_uncached(cleaver)
+            self.store(key, result)
+        else:
+            self.hits += 1
+            self.entries[key] = result
+            if not isinstance(result, Unparseable):
+                result = result.copy()
+                cleaver.name = result
+
+        if isinstance(result, Unparseable):
+            return cleaver.cannot_parse(safe, reason=result.reason)
+
+        return result
+
+    def parse_uncached(self, cleaver):
+        try:
+            return cleaver.parse_name(safe=False)
+        except UnparseableNameException, e:
+            return Unparseable(e.reason)
+
+    def store(self, key, result):
+        if self.maxsize <= 0:
+            return
+
+        if not isinstance(result, Unparseable):
+            result = result.copy()
+
+        self.entries[key] = result
+
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def flush(self):
+        """ Nothing to do; called by parse_many when it's done, for caches that write behind. """
+
+    def stats(self):
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hit_rate': float(self.hits) / lookups if lookups else 0.0,
+        }
+
+
+package_dir = os.path.dirname(os.path.abspath(__file__))
+rules_versions = {}
+
+def rules_version(directory=package_dir):
+    """
+    A fingerprint of the parsing rules: a hash of every module in the package
+    (tests aside), plus the Python and marshal versions, since those decide
+    how cached names are stored. Editing any of them changes the version.
+    """
+    try:
+        return rules_versions[directory]
+    except KeyError:
+        digest = hashlib.sha1('python %d.%d marshal %d' % (sys.version_info[0], sys.version_info[1], marshal.version))
+
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith('.py') and not filename.startswith('test_'):
+                digest.update(filename)
+                with open(os.path.join(directory, filename), 'rb') as source:
+                    digest.update(source.read())
+
+        version = rules_versions[directory] = digest.hexdigest()[:16]
+        return version
+
+
+tables_versions = {}
+
+def tables_version(cleaver_class):
+    """
+    A fingerprint of the tables a cleaver class's names are built with, which
+    users can change without touching the package: the abbreviations, stop
+    words and case exceptions of its object_class, and the contents of the
+    files it reads more of them from. Read once per process, like the tables.
+    """
+    try:
+        return tables_versions[cleaver_class]
+    except KeyError:
+        object_class = cleaver_class.object_class
+        digest = hashlib.sha1()
+
+        digest.update(repr(sorted(getattr(object_class, 'abbreviations', {}).items())))
+        digest.update(repr(sorted(getattr(object_class, 'stop_words', ()))))
+        digest.update(repr(list(object_class.case_exceptions)))
+
+        for path in list(getattr(object_class, 'abbreviation_files', ())) + list(object_class.case_exception_files):
+            digest.update(path)
+            try:
+                with open(path, 'rb') as table:
+                    digest.update(table.read())
+            except IOError:
+                digest.update('unreadable')
+
+        version = tables_versions[cleaver_class] = digest.hexdigest()[:16]
+        return version
+
+
+def name_classes():
+    """ Every class of name object a cleaver can return, subclasses included, by class name. """
+    classes = {}
+    pending = [ Name, PoliticalMetadata ]
+
+    while pending:
+        cls = pending.pop()
+        classes[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+
+    return classes
+
+
+def dump_name(name):
+    """ A name object as a (class name, {part: value}) tuple of builtins, without empty or transient parts. """
+    state = name.__getstate__() if isinstance(name, Name) else name.__dict__
+    transient = getattr(name, 'transient_slots', ())
+
+    return (type(name).__name__, dict((attr, dump_name(value) if isinstance(value, (Name, PoliticalMetadata)) else value)
+            for attr, value in state.iteritems() if value is not None and attr not in transient))
+
+
+def load_name(dumped, classes):
+    class_name, state = dumped
+    cls = classes[class_name]
+    name = object.__new__(cls)
+
+    for slot in all_slots(cls):
+        setattr(name, slot, None)
+
+    for attr, value in state.iteritems():
+        setattr(name, attr, load_name(value, classes) if isinstance(value, tuple) else value)
+
+    return name
+
+
+class PersistentParseCache(object):
+    """
+    A parse cache kept in a SQLite database, so results survive from one run
+    to the next and are shared by every process using the same file:
+
+        BaseNameCleaver.parse_cache = PersistentParseCache('/var/cache/name_cleaver.db')
+
+    Entries are keyed by the rules version (see rules_version), the cleaver
+    class with a fingerprint of its tables (see tables_version) and the raw
+    input, so upgrading the library, editing its rules, or changing a table
+    of abbreviations or case exceptions (or the files they're read from)
+    starts a fresh set of entries rather than returning stale parses. Pass a
+    version of your own if your cleaver subclasses change the parse in other
+    ways; prune() deletes the entries of every other version. (Entries made
+    with an old table are only pruned once the version changes too.)
+
+    The database is opened in WAL mode, so readers don't block while another
+    process writes, and writers wait up to timeout seconds for each other.
+    New results are written batch_size at a time; parse_many writes out
+    whatever's left when it finishes, and so does close(), or leaving a with
+    block, otherwise call flush(). Each process opens its own connection, so
+    a cache created before forking worker processes is safe to use in them.
+    Within a process, one cache can be shared by any number of threads: they
+    use the same connection and pending results, under a lock, so lookups
+    and writes take turns (parsing a miss doesn't hold the lock).
+
+    Names are stored as the marshalled values of their parts, and rebuilt on
+    a hit; inputs that can't be parsed are cached too (as the reason they
+    couldn't be), and fail the same way again.
+    """
+
+    def __init__(self, path, version=None, timeout=30.0, batch_size=1000):
+        self.path = path
+        self.version = version or rules_version()
+        self.timeout = timeout
+        self.batch_size = batch_size
+
+        self.db = None
+        self.pid = None
+        self.lock_pid = None
+        self.process_lock = None
+        self.pending = {}
+        self.classes = name_classes()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def lock(self):
+        # made afresh in a forked copy, where another thread may have been holding it
+        if self.lock_pid != os.getpid():
+            self.lock_pid = os.getpid()
+            self.process_lock = threading.RLock()
+
+        return self.process_lock
+
+    @property
+    def connection(self):
+        """ This process's connection; only use it holding the lock. """
+        if self.db is None or self.pid != os.getpid():
+            if self.pid is not None and self.pid != os.getpid():
+                # a forked copy; our parent will write out what it had pending
+                self.pending = {}
+            self.db = self.connect()
+            self.pid = os.getpid()
+
+        return self.db
+
+    def connect(self):
+        db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        db.text_factory = str
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute('CREATE TABLE IF NOT EXISTS parses (version TEXT NOT NULL, cleaver TEXT NOT NULL, input TEXT NOT NULL, '
+                'parsed BLOB, PRIMARY KEY (version, cleaver, input)) WITHOUT ROWID')
+        return db
+
+    def key(self, cleaver):
+        # repr() keeps str and unicode inputs apart, as they parse to str and unicode names
+        cleaver_class = type(cleaver)
+        return (self.version, '{0} {1}'.format(cleaver_class.__name__, tables_version(cleaver_class)), repr(cleaver.orig_str))
+
+    def parse(self, cleaver, safe=False):
+        key = self.key(cleaver)
+        result = self.lookup(key)
+
+        if result is None:
+            result = self.parse_uncached(cleaver)
+            self.store(key, result)
+        elif not isinstance(result, Unparseable):
+            cleaver.name = result
+
+        if isinstance(result, Unparseable):
+            return cleaver.cannot_parse(safe, reason=result.reason)
+
+        return result
+
+    def lookup(self, key):
+        """ The cached result for key, or None if there isn't one (or it can no longer be rebuilt); counts the hit or miss. """
+        with self.lock:
+            try:
+                dumped = self.pending[key]
+            except KeyError:
+                row = self.connection.execute('SELECT parsed FROM parses WHERE version = ? AND cleaver = ? AND input = ?', key).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                dumped = row[0]
+
+            result = self.rebuild(dumped)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return result
+
+    def rebuild(self, dumped):
+        """ The result stored as dumped, or None if it can no longer be rebuilt. """
+        if dumped is None:
+            return Unparseable()
+
+        try:
+            loaded = marshal.loads(str(dumped))
+            if loaded is None or isinstance(loaded, basestring):
+                # a failure, stored as its reason
+                return Unparseable(loaded)
+            return load_name(loaded, self.classes)
+        except KeyError:
+            # a class defined since we started; look again, and failing that, parse afresh
+            self.classes = name_classes()
+            try:
+                return load_name(loaded, self.classes)
+            except KeyError:
+                return None
+        except (ValueError, EOFError, TypeError):
+            return None
+
+    def parse_uncached(self, cleaver):
+        try:
+            return cleaver.parse_name(safe=False)
+        except UnparseableNameException, e:
+            return Unparseable(e.reason)
+
+    def store(self, key, result):
+        dumped = marshal.dumps(result.reason if isinstance(result, Unparseable) else dump_name(result))
+
+        with self.lock:
+            self.pending[key] = dumped
+
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """ Writes out any results not yet in the database. """
+        with self.lock:
+            if not self.pending:
+                return
+
+            db = self.connection
+            rows = [ key + (buffer(dumped) if dumped is not None else None,) for key, dumped in self.pending.iteritems() ]
+
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                db.executemany('INSERT OR IGNORE INTO parses VALUES (?, ?, ?, ?)', rows)
+            except:
+                db.execute('ROLLBACK')
+                raise
+            db.execute('COMMIT')
+
+            self.writes += len(rows)
+            self.pending = {}
+
+    def prune(self):
+        """ Deletes the entries of every other rules version, returning how many there were. """
+        with self.lock:
+            self.flush()
+            return self.connection.execute('DELETE FROM parses WHERE version != ?', (self.version,)).rowcount
+
+    def close(self):
+        with self.lock:
+            if self.db is not None and self.pid == os.getpid():
+                self.flush()
+                self.db.close()
+            self.db = None
+            self.pid = None
+
+    def __len__(self):
+        with self.lock:
+            self.flush()
+            return self.connection.execute('SELECT count(*) FROM parses WHERE version = ?', (self.version,)).fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'pending': len(self.pending),
+            'hit_rate': float(self.hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,112 @@
+"""
+Restores the case of name parts that came to us in all capitals (or all
+lowercase), a word at a time.
+
+Every part is title-cased, and then only the rules it could possibly need
+are run: the Scottish rule for parts containing "mc" or "mac", the PAC
+rules for parts containing "pac", and the possessive rule for parts with
+an "'S". Most names need none of them, and so no regular expression work.
+
+Last come the exceptions, if there are any: a lexicon of words whose
+spelling can't be worked out by rule ("DeLauro", "AFL-CIO"). Each word is
+looked up lowercased in a dict, so the lexicon costs the same however big
+it gets. A word is looked up without its possessive 's, and a hyphenated
+word that isn't in the lexicon is looked up a part at a time.
+"""
+import codecs
+import patterns
+
+
+class CaseRestorer(object):
+    """
+    Title-cases name parts, fixing up Scottish surnames, PAC and possessives
+    on request, and then applying the exceptions (spellings given exactly as
+    they should appear):
+
+        >>> CaseRestorer(['DeLauro', 'AFL-CIO']).restore('ROSA DELAURO, AFL-CIO')
+        'Rosa DeLauro, AFL-CIO'
+    """
+
+    def __init__(self, exceptions=(), scottish_re=patterns.SCOTTISH):
+        self.exceptions = {}
+        self.scottish_re = scottish_re
+        # the stock pattern can only match where there's an "mc" or a "mac"
+        self.scottish_hints = ('mc', 'mac') if scottish_re is patterns.SCOTTISH else ('',)
+        self.update(exceptions)
+
+    def __len__(self):
+        return len(self.exceptions)
+
+    def update(self, exceptions):
+        """ Adds spellings to the exceptions; a later spelling of the same word wins. """
+        for spelling in exceptions:
+            self.exceptions[spelling.lower()] = spelling
+
+    def restore(self, text, scots=False, pac=False, possessives=False):
+        name = text.title()
+
+        if not (scots or pac or possessives or self.exceptions):
+            return name
+
+        if scots or pac:
+            lowered = name.lower()
+            scots = scots and any(x in lowered for x in self.scottish_hints)
+            if scots:
+                name = self.uppercase_the_scots(name)
+
+            if pac and 'pac' in lowered:
+                if patterns.SINGLE_WORD_PAC.match(name):
+                    name = name.upper() # if there's only one word that ends in PAC, make the whole thing uppercase
+                else:
+                    name = patterns.PAC.sub('PAC', name) # otherwise just uppercase the PAC part
+
+                if scots:
+                    name = self.uppercase_the_scots(name)
+
+        if possessives and "'S" in name:
+            name = patterns.POSSESSIVE.sub("\\1's", name)
+
+        if self.exceptions:
+            name = self.apply_exceptions(name)
+
+        return name
+
+    def uppercase_the_scots(self, name):
+        match = self.scottish_re.search(name)
+
+        if match:
+            mc = match.group('mc')
+            first_letter = match.group('first_letter')
+            return name.replace(mc + first_letter, mc.title() + first_letter.upper())
+        else:
+            return name
+
+    def apply_exceptions(self, name):
+        return patterns.CASE_EXCEPTION_WORD.sub(self.restore_word, name)
+
+    def restore_word(self, match):
+        """
+        The exception's spelling of a matched word, if there is one; failing
+        that, of each of its hyphenated parts. A possessive 's is left as it was.
+        """
+        word = match.group()
+        possessive = ''
+        if word[-2:] in ("'s", "'S"):
+            word, possessive = word[:-2], word[-2:]
+
+        spelling = self.exceptions.get(word.lower())
+        if spelling is None:
+            if '-' not in word:
+                return match.group()
+            spelling = '-'.join([ self.exceptions.get(x.lower(), x) for x in word.split('-') ])
+
+        return spelling + possessive
+
+
+def read_exceptions(path):
+    """
+    Reads spellings from a UTF-8 text file, one per line. Blank lines and
+    lines starting with # are skipped.
+    """
+    with codecs.open(path, encoding='utf-8') as lines:
+        return [ x.strip() for x in lines if x.strip() and not x.strip().startswith('#') ]
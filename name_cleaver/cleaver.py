@@ -1,23 +1,117 @@
 import re
-from exception import UnparseableNameException
-from names import SUFFIX_RE, DEGREE_RE, PersonName, PoliticianName, RunningMatesNames, \
-    OrganizationName
-from nicknames import NICKNAMES
+from exception import UnparseableNameException, MISSING_LAST_NAME, TOO_LONG
+from names import PersonName, PoliticianName, RunningMatesNames, OrganizationName
+from nicknames import NICKNAME_INDEX
+from tokens import may_contain_honorific, may_contain_junk_numbers, may_contain_nickname, WORD, INITIAL
+import patterns
+import vectorized
 
 
 class BaseNameCleaver(object):
+    # an optional cache.ParseCache (or PersistentParseCache) consulted before
+    # parsing; shared by every cleaver class it's set on (results are keyed
+    # by cleaver class)
+    parse_cache = None
+    # an optional telemetry.Telemetry, told the outcome and duration of every
+    # parse (cache hits aside); shared like parse_cache
+    telemetry = None
+    # inputs longer than this many characters, or with more than this many
+    # whitespace-separated tokens, aren't parsed at all (None for no limit)
+    max_length = 1000
+    max_tokens = 100
+    # whether inputs already in a clean shape are built directly by
+    # parse_clean_name; subclasses that change what the parsing stages do
+    # to such inputs should turn this off
+    fast_path = True
+
     def __init__(self, string):
+        self.reset(string)
+
+    def reset(self, string):
+        """
+        Points the cleaver at a new input string, discarding anything left over
+        from parsing the previous one.
+        """
         self.name = string
         self.orig_str = string
 
-    def cannot_parse(self, safe, e=None):
+    @classmethod
+    def parse_many(cls, strings, safe=True):
+        """
+        Parses every string in an iterable, yielding the results in input order.
+        One cleaver is reused for the whole run, and nothing is held on to between
+        strings, so any number of names can be streamed through. Once the strings
+        run out, the parse cache (if any) is flushed.
+        """
+        cleaver = cls(None)
+
+        for string in strings:
+            cleaver.reset(string)
+            yield cleaver.parse(safe=safe)
+
+        if cls.parse_cache is not None:
+            cls.parse_cache.flush()
+
+    def parse(self, safe=False):
+        # inputs over the limits aren't cached: the limits aren't part of the
+        # cache key, and one memo field shouldn't take up a kilobyte of cache
+        if self.parse_cache is not None and self.orig_str and not self.too_long(self.orig_str):
+            return self.parse_cache.parse(self, safe)
+
+        return self.parse_name(safe)
+
+    def parse_name(self, safe=False):
+        if self.telemetry is None:
+            self.name = self.build(self.orig_str, safe)
+        else:
+            self.name = self.telemetry.build(self, self.orig_str, safe)
+        return self.name
+
+    def build(self, string, safe=False):
+        """
+        Parses string and returns the result, as parse_name() would for a
+        cleaver pointed at it. Only the class's rules are used; nothing is
+        read from or written to the cleaver itself, so any number of threads
+        can build with the same cleaver at once (see engine()).
+        """
+        raise NotImplementedError("Subclasses of BaseNameCleaver must implement build.")
+
+    @classmethod
+    def engine(cls):
+        """ A CleaverEngine that parses with this class's rules, and can be shared between threads. """
+        return CleaverEngine(cls)
+
+    def too_long(self, string):
+        """ Whether string is over max_length or max_tokens, so that one stray memo field can't hold up a bulk run. """
+        if not isinstance(string, basestring):
+            return False
+
+        if self.max_length is not None and len(string) > self.max_length:
+            return True
+
+        # a string can't have more tokens than characters
+        return self.max_tokens is not None and len(string) > self.max_tokens and len(string.split()) > self.max_tokens
+
+    def parse_clean_name(self, string):
+        """
+        Returns the parsed name if string is in a shape that the full parse
+        would leave exactly as it is, or None if it needs the full parse.
+        """
+        return None
+
+    def cannot_parse(self, safe, e=None, string=None, reason=None):
+        if string is None:
+            string = self.orig_str
+
         if safe:
-            return self.orig_str
+            return string
         else:
             # uncomment for debugging
             #if e:
             #   print e
-            raise UnparseableNameException(u"Couldn't parse name: {0}".format(self.name))
+            exception = UnparseableNameException(u"Couldn't parse name: {0}".format(string))
+            exception.reason = reason or (type(e).__name__ if e is not None else MISSING_LAST_NAME)
+            raise exception
 
     def get_object_class(self):
         return self.object_class()
@@ -25,42 +119,79 @@ class BaseNameCleaver(object):
 
 class IndividualNameCleaver(BaseNameCleaver):
     object_class = PersonName
+    nickname_index = NICKNAME_INDEX
 
     def __init__(self, string):
         super(IndividualNameCleaver, self).__init__(string)
 
-    def parse(self, safe=False):
-        if not self.orig_str:
+    def build(self, string, safe=False):
+        if not string:
             return ''
 
-        if not ' ' in self.name:
-            self.name = self.get_object_class().new_from_tokens(self.name)
-            return self.name.case_name_parts()
-        else:
+        if self.too_long(string):
+            return self.cannot_parse(safe, string=string, reason=TOO_LONG)
+
+        if self.fast_path:
+            clean_name = self.parse_clean_name(string)
+            if clean_name is not None:
+                return clean_name
+
+        if not ' ' in string:
             try:
-                self.name = self.pre_process(self.name)
+                name = self.get_object_class().new_from_tokens(string)
+            except Exception, e:
+                return self.cannot_parse(safe, e, string)
+            return name.case_name_parts()
 
-                name, honorific, suffix, nick = self.separate_affixes(self.name)
+        try:
+            name = self.pre_process(string)
 
-                if honorific and not honorific.endswith('.'):
-                    honorific += '.'
+            name, honorific, suffix, nick = self.separate_affixes(name)
 
-                name = self.reverse_last_first(name)
-                self.name = self.convert_name_to_obj(name, nick, honorific, suffix)
-            except Exception, e:
-                return self.cannot_parse(safe, e)
-            finally:
-                if (isinstance(self.name, self.object_class) and self.name.last):
-                    return self.name.case_name_parts()
-                else:
-                    return self.cannot_parse(safe)
+            if honorific and not honorific.endswith('.'):
+                honorific += '.'
+
+            name = self.reverse_last_first(name)
+            name = self.convert_name_to_obj(name, nick, honorific, suffix)
+        except Exception, e:
+            return self.cannot_parse(safe, e, string)
+
+        if isinstance(name, self.object_class) and name.last:
+            return name.case_name_parts()
+        else:
+            return self.cannot_parse(safe, string=string)
+
+    def parse_clean_name(self, string):
+        """
+        Builds "First Last" and "First M. Last" directly. Inputs in that shape,
+        with no affix, family name prefix or roman numeral among their words,
+        go through every stage of the full parse unchanged.
+        """
+        if not isinstance(string, basestring) or not patterns.CLEAN_PERSON_NAME.match(string):
+            return None
+
+        object_class = self.object_class
+        tokens = string.split(' ')
+        kinds = object_class.token_classifier.classify_all(tokens)
+
+        if kinds[0] is not WORD or kinds[-1] is not WORD or (len(tokens) == 3 and kinds[1] is not INITIAL):
+            return None
+
+        name = object_class()
+        name.first = tokens[0]
+        name.last = tokens[-1]
+
+        if len(tokens) == 3:
+            name.middle = tokens[1] if len(tokens[1]) == 2 else tokens[1] + '.'
+
+        return name
 
     def pre_process(self, name):
         # strip any spaces padding parenthetical phrases
-        name = re.sub('\(\s*([^)]+)\s*\)', '(\1)', name)
+        name = patterns.sub_parentheticals(patterns.PARENTHETICAL_PADDING, '(\1)', name)
 
         # get rid of trailing '& mrs'
-        name = re.sub(' (?i)\& mrs\.?$', '', name)
+        name = patterns.TRAILING_AND_MRS.sub('', name)
 
         return name
 
@@ -68,35 +199,68 @@ class IndividualNameCleaver(BaseNameCleaver):
 
         name, suffix = self.extract_suffix(name)
 
-        name, honorific = self.extract_matching_portion(r'\b(?P<honorific>[dm][rs]s?[,.]?)(?=(\b|\s))+', name)
+        honorific = nick = None
+
+        if may_contain_honorific(name):
+            name, honorific = self.extract_matching_portion(patterns.HONORIFIC, name)
 
         if suffix:
             suffix = suffix.replace('.', '')
 
-        name, junk = self.extract_matching_portion(r'(?P<junk_numbers>\b\d{2,}(?=(\b|\s))+)', name)
-        name, nick = self.extract_matching_portion(r'("[^"]+")', name)
+        if may_contain_junk_numbers(name):
+            name, junk = self.extract_matching_portion(patterns.JUNK_NUMBERS, name)
+        if may_contain_nickname(name):
+            name, nick = self.extract_matching_portion(patterns.QUOTED_NICKNAME, name)
 
         # strip trailing non alphanumeric characters
-        name = re.sub(r'[^a-zA-Z0-9]$', '', name)
+        name = patterns.TRAILING_NON_ALPHANUMERIC.sub('', name)
 
         return name, honorific, suffix, nick
 
     def extract_matching_portion(self, pattern, name):
-        m = re.finditer(pattern, name, flags=re.IGNORECASE)
+        if isinstance(pattern, basestring):
+            pattern = re.compile(pattern, re.IGNORECASE)
 
         matched_portion = None
         match_strings = []
 
-        for match in m:
+        for match in pattern.finditer(name):
             matched_piece = match.group()
             match_strings.append(matched_piece)
-            name = re.sub('\s?{0}'.format(matched_piece), '', name)
+            name = self.remove_matched_piece(name, matched_piece)
 
         if len(match_strings):
             matched_portion = ' '.join(match_strings)
 
         return name, matched_portion
 
+    def remove_matched_piece(self, name, piece):
+        """
+        Removes every occurrence of piece from name, along with a single whitespace
+        character preceding each one. The piece is treated as a literal string,
+        never as a pattern, so matches containing '.' or quotes are removed verbatim.
+        """
+        if not piece:
+            return name
+
+        kept = []
+        start = 0
+        found = name.find(piece)
+
+        while found != -1:
+            end = found
+            if found > start and name[found - 1] in ' \t\n\r\f\v':
+                end -= 1
+            kept.append(name[start:end])
+            start = found + len(piece)
+            found = name.find(piece, start)
+
+        if not kept:
+            return name
+
+        kept.append(name[start:])
+        return ''.join(kept)
+
     def extract_suffix(self, name):
         """
         Returns a tuple of (name, suffix), or (name, None) if no suffix could be found.
@@ -106,8 +270,8 @@ class IndividualNameCleaver(BaseNameCleaver):
         """
         # don't extract suffixes if we can't reasonably suspect we have enough parts to the name for there to be one
         if len(name.strip().split()) > 2:
-            name, suffix = self.extract_matching_portion(r'\b(?P<suffix>{})(?=\b|\s|\Z|\W)'.format(SUFFIX_RE), name)
-            suffix, degree = self.extract_matching_portion(DEGREE_RE, suffix or '')
+            name, suffix = self.extract_matching_portion(patterns.SUFFIX, name)
+            suffix, degree = self.extract_matching_portion(patterns.DEGREE, suffix or '')
             return name, suffix or None
 
         return name, None
@@ -119,7 +283,7 @@ class IndividualNameCleaver(BaseNameCleaver):
         # make sure we don't put a suffix in the middle, as in "Smith, Tom II"
         name, suffix = self.extract_suffix(name)
 
-        split = re.split(', ?', name)
+        split = patterns.LAST_FIRST_SEPARATOR.split(name)
 
         # make sure that the comma is not just preceding a suffix, such as "Jr",
         # by checking that we have at least 2 name parts and the last doesn't match
@@ -135,12 +299,28 @@ class IndividualNameCleaver(BaseNameCleaver):
     def convert_name_to_obj(self, name, nick, honorific, suffix):
         name = ' '.join([x.strip() for x in [name, nick, suffix, honorific] if x])
 
-        return self.get_object_class().new_from_tokens(*[x for x in re.split('\s+', name)], **{'allow_quoted_nicknames': True})
+        return self.get_object_class().new_from_tokens(*[x for x in patterns.WHITESPACE.split(name)], **{'allow_quoted_nicknames': True})
 
     @classmethod
     def name_processing_failed(cls, subject_name):
         return subject_name and (isinstance(subject_name, RunningMatesNames) or not subject_name.last)
 
+    @classmethod
+    def encode_candidates(cls, names):
+        """ Encodes names for compare_many, which is worth doing once for a block that's scored repeatedly. Needs numpy. """
+        return vectorized.PersonFeatures(names, cls.nickname_index)
+
+    @classmethod
+    def compare_many(cls, name, candidates):
+        """
+        Scores name against each of the candidates (a list of names, or the
+        result of encode_candidates) as compare() would, returning a NumPy
+        array of scores. Needs numpy.
+        """
+        if not isinstance(candidates, vectorized.PersonFeatures):
+            candidates = cls.encode_candidates(candidates)
+        return vectorized.compare_people(name, candidates)
+
     @classmethod
     def compare(cls, name1, name2):
         score = 0
@@ -155,10 +335,8 @@ class IndividualNameCleaver(BaseNameCleaver):
         if name1.first and name2.first and name1.first == name2.first:
             score += 1
         elif name1.first and name2.first:
-            for name_set in NICKNAMES:
-                if set(name_set).issuperset([name1.first, name2.first]):
-                    score += 0.6
-                    break
+            if cls.nickname_index.are_equivalent(name1.first, name2.first):
+                score += 0.6
 
             if name1.first == name2.middle and name2.first == name1.middle:
                 score += 0.8
@@ -195,28 +373,40 @@ class PoliticianNameCleaver(IndividualNameCleaver):
     def __init__(self, string):
         super(PoliticianNameCleaver, self).__init__(string)
 
-    def parse(self, safe=False):
-        if not self.orig_str:
+    def build(self, string, safe=False):
+        if not string:
             return ''
 
-        if not ' ' in self.name:
-            self.name = self.get_object_class().new_from_tokens(self.name)
-            return self.name.case_name_parts()
-        else:
+        if self.too_long(string):
+            return self.cannot_parse(safe, string=string, reason=TOO_LONG)
+
+        if self.fast_path:
+            clean_name = self.parse_clean_name(string)
+            if clean_name is not None:
+                return clean_name
+
+        if not ' ' in string:
             try:
-                self.strip_party()
-                self.name = self.convert_name_to_obj(self.name)  # important for "last, first", and also running mates
+                name = self.get_object_class().new_from_tokens(string)
             except Exception, e:
-                return self.cannot_parse(safe, e)
-            finally:
-                if ((isinstance(self.name, self.object_class) and self.name.last) or isinstance(self.name, RunningMatesNames)):
-                    return self.name.case_name_parts()
-                else:
-                    return self.cannot_parse(safe)
+                return self.cannot_parse(safe, e, string)
+            return name.case_name_parts()
+
+        try:
+            name = self.strip_party(string)
+            name = self.convert_name_to_obj(name)  # important for "last, first", and also running mates
+        except Exception, e:
+            return self.cannot_parse(safe, e, string)
 
-    def strip_party(self):
-        if '(' in self.name:
-            self.name = re.sub(r'\s*\([^)]+\)\s*$', '', self.name)
+        if (isinstance(name, self.object_class) and name.last) or isinstance(name, RunningMatesNames):
+            return name.case_name_parts()
+        else:
+            return self.cannot_parse(safe, string=string)
+
+    def strip_party(self, name):
+        if '(' in name and name.rstrip().endswith(')'):
+            name = patterns.strip_trailing_parenthetical(patterns.PARTY, name)
+        return name
 
     def convert_name_to_obj(self, name):
         if '&' in name or '/' in name:
@@ -226,10 +416,10 @@ class PoliticianNameCleaver(IndividualNameCleaver):
 
     def convert_regular_name_to_obj(self, name):
         name = self.reverse_last_first(name)
-        return self.get_object_class().new_from_tokens(*[x for x in re.split('\s+', name) if x])
+        return self.get_object_class().new_from_tokens(*[x for x in patterns.WHITESPACE.split(name) if x])
 
     def convert_running_mates_names_to_obj(self, name):
-        return RunningMatesNames(*[self.convert_name_to_obj(x) for x in re.split(' [&/] ', name)])
+        return RunningMatesNames(*[self.convert_name_to_obj(x) for x in patterns.RUNNING_MATES_SEPARATOR.split(name)])
 
 
 class OrganizationNameCleaver(BaseNameCleaver):
@@ -238,29 +428,63 @@ class OrganizationNameCleaver(BaseNameCleaver):
     def __init__(self, string):
         super(OrganizationNameCleaver, self).__init__(string)
 
-    def parse(self, safe=False):
-        if not self.orig_str:
+    def build(self, string, safe=False):
+        if not string:
             return ''
 
-        try:
-            self.name = self.name.strip()
+        if self.too_long(string):
+            return self.cannot_parse(safe, string=string, reason=TOO_LONG)
+
+        if self.fast_path:
+            clean_name = self.parse_clean_name(string)
+            if clean_name is not None:
+                return clean_name
 
-            self.name = self.get_object_class().new(self.name)
+        try:
+            name = self.get_object_class().new(string.strip())
         except Exception, e:
-            return self.cannot_parse(safe, e)
-        finally:
-            if isinstance(self.name, self.object_class):
-                return self.name.case_name_parts()
-            else:
-                return self.cannot_parse(safe)
+            return self.cannot_parse(safe, e, string)
+
+        return name.case_name_parts()
 
     def convert_name_to_obj(self):
         self.name = self.get_object_class().new(self.name)
 
+    def parse_clean_name(self, string):
+        """
+        Builds names that are already mixed case and have no parenthetical,
+        hyphenated or other extra phrase, which case_name_parts leaves alone.
+        """
+        if not isinstance(string, basestring):
+            return None
+
+        name = string.strip()
+        if patterns.EXTRA_PHRASE_HINT.search(name) or not patterns.MIXED_CASE.search(name):
+            return None
+
+        return self.get_object_class().new(name)
+
     @classmethod
     def name_processing_failed(cls, subject_name):
         return not isinstance(subject_name, cls.object_class)
 
+    @classmethod
+    def encode_candidates(cls, names):
+        """ Encodes names for compare_many, which is worth doing once for a block that's scored repeatedly. Needs numpy. """
+        return vectorized.OrganizationFeatures(names)
+
+    @classmethod
+    def compare_many(cls, match, candidates):
+        """
+        Scores match against each of the candidates (a list of names, or the
+        result of encode_candidates) as compare(match, candidate) would,
+        returning a NumPy array of scores in which compare()'s None is 0.
+        Needs numpy.
+        """
+        if not isinstance(candidates, vectorized.OrganizationFeatures):
+            candidates = cls.encode_candidates(candidates)
+        return vectorized.compare_organizations(match, candidates)
+
     @classmethod
     def compare(cls, match, subject):
         """
@@ -278,3 +502,43 @@ class OrganizationNameCleaver(BaseNameCleaver):
                 return 3
         else:
             return 2
+
+
+class CleaverEngine(object):
+    """
+    Parses strings with a cleaver class's rules, without keeping anything
+    from one call to the next. An engine is made once and can then be shared
+    by any number of threads:
+
+        engine = IndividualNameCleaver.engine()
+        name = engine.parse('SMITH, ROBERT J')
+
+    The cleaver class's parse_cache isn't consulted, since caches are shared,
+    mutable state; wrap the engine in one of your own if you need it. Its
+    telemetry, if any, is told about every parse.
+    """
+    __slots__ = ('cleaver_class', 'cleaver')
+
+    def __init__(self, cleaver_class):
+        self.cleaver_class = cleaver_class
+        # only ever asked to build(), which leaves the cleaver untouched
+        self.cleaver = cleaver_class(None)
+
+    def parse(self, string, safe=False):
+        cleaver = self.cleaver
+
+        if cleaver.telemetry is None:
+            return cleaver.build(string, safe)
+        return cleaver.telemetry.build(cleaver, string, safe)
+
+    __call__ = parse
+
+    def parse_many(self, strings, safe=True):
+        """ Parses every string in an iterable, yielding the results in input order. """
+        parse = self.parse
+
+        for string in strings:
+            yield parse(string, safe)
+
+    def __repr__(self):
+        return '<CleaverEngine for {0}>'.format(self.cleaver_class.__name__)
@@ -0,0 +1,108 @@
+"""
+Column-at-a-time cleaning. Campaign finance columns repeat the same strings
+over and over, so rather than parse every row, these functions find the
+distinct values, parse each of those once, and map the results back onto
+the rows.
+
+Output columns are the fields of records.PersonRecord (first, middle, last,
+suffix, honorific, nick, cleaned, ok) for the individual and politician
+cleavers, and of records.OrganizationRecord (cleaned, expanded, kernel, ok)
+for organizations. Rows whose input is missing (None, NaN or null) get
+missing values in every column.
+
+pandas and pyarrow are optional; they're only imported by the functions
+that need them.
+"""
+from records import PersonRecord, OrganizationRecord, parse_records
+from names import OrganizationName
+
+
+def record_class(cleaver_class):
+    if issubclass(cleaver_class.object_class, OrganizationName):
+        return OrganizationRecord
+    return PersonRecord
+
+
+def factorize(values):
+    """
+    Returns (codes, uniques): the distinct strings in values, in order of first
+    appearance, and for each value the position of its string in uniques.
+    Anything that isn't a string gets a code of -1.
+    """
+    codes = []
+    uniques = []
+    positions = {}
+
+    for value in values:
+        if not isinstance(value, basestring):
+            codes.append(-1)
+            continue
+
+        try:
+            code = positions[value]
+        except KeyError:
+            code = positions[value] = len(uniques)
+            uniques.append(value)
+
+        codes.append(code)
+
+    return codes, uniques
+
+
+def clean_values(cleaver_class, values):
+    """
+    Cleans a sequence of strings, returning a dict of output columns (lists
+    aligned with values).
+    """
+    codes, uniques = factorize(values)
+    records = parse_records(cleaver_class, uniques)
+    fields = record_class(cleaver_class)._fields
+
+    columns = {}
+    for position, field in enumerate(fields):
+        parsed = [ x[position] for x in records ]
+        columns[field] = [ parsed[code] if code >= 0 else None for code in codes ]
+
+    return columns
+
+
+def clean_series(cleaver_class, series):
+    """
+    Cleans a pandas Series of strings, returning a DataFrame of output columns
+    with the same index as the series.
+    """
+    import pandas
+
+    codes, uniques = pandas.factorize(series)
+    fields = record_class(cleaver_class)._fields
+    records = parse_records(cleaver_class, list(uniques))
+
+    # a row of missing values at the end, for the -1 codes of missing inputs to point at
+    records.append((None,) * len(fields))
+    codes[codes < 0] = len(records) - 1
+
+    unique_frame = pandas.DataFrame.from_records(records, columns=fields)
+    frame = unique_frame.take(codes)
+    frame.index = series.index
+    return frame
+
+
+def clean_arrow(cleaver_class, array):
+    """
+    Cleans a pyarrow string array (or chunked array), returning a StructArray
+    with one field per output column, aligned with the input.
+    """
+    import pyarrow
+
+    if isinstance(array, pyarrow.ChunkedArray):
+        array = pyarrow.concat_arrays(array.chunks) if array.num_chunks else pyarrow.array([], pyarrow.string())
+
+    encoded = array.dictionary_encode()
+    fields = record_class(cleaver_class)._fields
+    records = parse_records(cleaver_class, encoded.dictionary.to_pylist())
+
+    columns = [ pyarrow.array([ x[position] for x in records ], type=pyarrow.bool_() if field == 'ok' else pyarrow.string())
+            for position, field in enumerate(fields) ]
+    uniques = pyarrow.StructArray.from_arrays(columns, names=list(fields))
+
+    return uniques.take(encoded.indices)
@@ -0,0 +1,102 @@
+from array import array
+from collections import defaultdict
+from index import PersonNameIndex
+
+
+class UnionFind(object):
+    """
+    Disjoint sets over the integers 0..size-1. Each set is represented by its
+    smallest member, so the result doesn't depend on the order of the unions.
+    """
+
+    def __init__(self, size):
+        self.parents = array('l', xrange(size))
+
+    def find(self, x):
+        parents = self.parents
+
+        while parents[x] != x:
+            # path halving: point x at its grandparent as we go
+            parents[x] = parents[parents[x]]
+            x = parents[x]
+
+        return x
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+
+        if a < b:
+            self.parents[b] = a
+        elif b < a:
+            self.parents[a] = b
+
+        return a != b
+
+
+def refined_blocks(index, block, max_block_size):
+    """
+    Splits a block that's too big to compare all-pairs on the index's refining
+    keys. The refining keys are all there is to split on, so a part that's
+    still too big (a thousand J. Smiths) is returned as it is.
+    """
+    if len(block) <= max_block_size:
+        return [ block ]
+
+    refined = defaultdict(list)
+    for position in block:
+        for key in index.refining_keys(index.names[position]):
+            refined[key].append(position)
+
+    return refined.values()
+
+
+def pairs_to_compare(index, positions, max_block_size):
+    """
+    Every pair of positions, if there are no more than max_block_size of them.
+    Otherwise the names are sorted and each is paired with the next
+    max_block_size - 1 (a sorted neighbourhood), so that no name is compared
+    more than 2 * (max_block_size - 1) times.
+    """
+    if len(positions) > max_block_size:
+        positions = sorted(positions, key=lambda x: unicode(index.names[x]).lower())
+        window = max_block_size - 1
+    else:
+        window = len(positions)
+
+    for i, a in enumerate(positions):
+        for b in positions[i + 1:i + 1 + window]:
+            yield a, b
+
+
+def cluster(names, index_class=PersonNameIndex, threshold=2, max_block_size=1000):
+    """
+    Groups duplicates in a list of parsed names, returning a cluster id for
+    each name: the position of the first name in its cluster.
+
+    Only names sharing a block of index_class are compared, using the index's
+    score() (normally its cleaver's compare()); pairs scoring at least
+    threshold are merged, along with everything already merged with either
+    of them. Use PhoneticPersonNameIndex to catch misspelled surnames too.
+    Blocks larger than max_block_size are split on the index's refining keys
+    first; what's still too big after that is only compared within a sliding
+    window over the sorted names, which can miss a few pairs but keeps the
+    work to at most max_block_size comparisons per name however skewed the
+    data is.
+    Names that can't be blocked (e.g. strings returned by a failed parse)
+    are left on their own.
+
+    For organizations, compare() gives unrelated names a 2, so use
+    OrganizationNameIndex with a threshold of 3 or more.
+    """
+    index = index_class(names)
+    clusters = UnionFind(len(index.names))
+
+    for block in index.blocks.itervalues():
+        for positions in refined_blocks(index, block, max_block_size):
+            for a, b in pairs_to_compare(index, positions, max_block_size):
+                if clusters.find(a) == clusters.find(b):
+                    continue
+                if index.score(index.names[a], index.names[b]) >= threshold:
+                    clusters.union(a, b)
+
+    return [ clusters.find(x) for x in xrange(len(index.names)) ]
@@ -0,0 +1,135 @@
+"""
+Runs the cleavers and the frozen reference implementation (reference.py)
+side by side and reports every input on which they disagree:
+
+    from name_cleaver import differential
+    report = differential.compare(IndividualNameCleaver, names)
+    print report.summary()
+
+Results are compared as records (see records.py), so every name part is
+checked, not just the cleaned string. Only the stock cleaver classes have a
+reference; a subclass is checked against its nearest stock ancestor, which
+is only useful if it means to parse the same way.
+
+From the command line, over files of names (one per line, UTF-8):
+
+    python -m name_cleaver.differential individual contributors.txt
+"""
+from collections import namedtuple
+import argparse
+import codecs
+import sys
+from cleaver import IndividualNameCleaver, PoliticianNameCleaver, OrganizationNameCleaver
+from records import to_record
+import reference
+
+REFERENCES = {
+    IndividualNameCleaver: reference.parse_individual,
+    PoliticianNameCleaver: reference.parse_politician,
+    OrganizationNameCleaver: reference.parse_organization,
+}
+CLEAVERS = {
+    'individual': IndividualNameCleaver,
+    'politician': PoliticianNameCleaver,
+    'organization': OrganizationNameCleaver,
+}
+
+Divergence = namedtuple('Divergence', 'input expected actual')
+
+
+def reference_for(cleaver_class):
+    for klass in cleaver_class.__mro__:
+        if klass in REFERENCES:
+            return REFERENCES[klass]
+    raise ValueError("There's no reference implementation for {0}.".format(cleaver_class.__name__))
+
+
+def outcome(function, *args):
+    """ What function returns, or the name of the exception it raises (as a 1-tuple, so it can't be mistaken for a record). """
+    try:
+        return function(*args)
+    except Exception, e:
+        return (type(e).__name__,)
+
+
+def divergences(cleaver_class, strings):
+    """ Yields a Divergence for each string that cleaver_class and its reference parse differently. """
+    parse_reference = reference_for(cleaver_class)
+    cleaver = cleaver_class(None)
+
+    def parse(string):
+        cleaver.reset(string)
+        return to_record(cleaver_class, string, cleaver.parse(safe=True))
+
+    for string in strings:
+        expected, actual = outcome(parse_reference, string), outcome(parse, string)
+        if expected != actual:
+            yield Divergence(string, expected, actual)
+
+
+class Report(object):
+    """ How many inputs were checked, and the ones that diverged (the first max_examples of them). """
+
+    def __init__(self, cleaver_class, max_examples=50):
+        self.cleaver_class = cleaver_class
+        self.max_examples = max_examples
+        self.checked = 0
+        self.diverged = 0
+        self.examples = []
+
+    @property
+    def ok(self):
+        return not self.diverged
+
+    def summary(self):
+        lines = [ u'{0}: {1} checked, {2} diverged'.format(self.cleaver_class.__name__, self.checked, self.diverged) ]
+
+        for divergence in self.examples:
+            lines.append(u'  input:    {0!r}'.format(divergence.input))
+            lines.append(u'  expected: {0!r}'.format(divergence.expected))
+            lines.append(u'  actual:   {0!r}'.format(divergence.actual))
+
+        return u'\n'.join(lines)
+
+
+def compare(cleaver_class, strings, max_examples=50):
+    """ Checks cleaver_class against its reference on every string, returning a Report. """
+    report = Report(cleaver_class, max_examples)
+
+    def counted(strings):
+        for string in strings:
+            report.checked += 1
+            yield string
+
+    for divergence in divergences(cleaver_class, counted(strings)):
+        report.diverged += 1
+        if len(report.examples) < max_examples:
+            report.examples.append(divergence)
+
+    return report
+
+
+def read_lines(path):
+    with codecs.open(path, encoding='utf-8') as lines:
+        for line in lines:
+            yield line.rstrip(u'\r\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('cleaver', choices=sorted(CLEAVERS))
+    parser.add_argument('paths', nargs='+', metavar='path')
+    parser.add_argument('--examples', type=int, default=50, help='divergent inputs to show')
+    args = parser.parse_args(argv)
+
+    diverged = 0
+    for path in args.paths:
+        report = compare(CLEAVERS[args.cleaver], read_lines(path), args.examples)
+        print report.summary().encode('utf-8')
+        diverged += report.diverged
+
+    return 1 if diverged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,9 @@
-
 class UnparseableNameException(Exception):
-    pass
+    # why the name couldn't be parsed: the name of the exception that stopped
+    # the parse, MISSING_LAST_NAME if the parse ran but found no last name, or
+    # TOO_LONG if the input was over the cleaver's max_length or max_tokens
+    reason = None
+
+
+MISSING_LAST_NAME = 'missing last name'
+TOO_LONG = 'too long'
@@ -0,0 +1,135 @@
+from collections import defaultdict
+from operator import itemgetter
+from cleaver import IndividualNameCleaver, OrganizationNameCleaver
+from names import PersonName, OrganizationName
+
+
+class NameIndex(object):
+    """
+    Holds a corpus of parsed names, grouped into blocks by key, so that a query
+    is only compared against the names sharing one of its keys instead of
+    against the whole corpus.
+    """
+    cleaver_class = None
+
+    def __init__(self, names=()):
+        self.names = []
+        self.blocks = defaultdict(list)
+
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def blocking_keys(self, name):
+        raise NotImplementedError("Subclasses of NameIndex must implement blocking_keys.")
+
+    def refining_keys(self, name):
+        """
+        Narrower keys used to split up a block that's too big to compare
+        all-pairs. Names sharing none of these keys are unlikely to score well
+        against each other.
+        """
+        raise NotImplementedError("Subclasses of NameIndex must implement refining_keys.")
+
+    def add(self, name):
+        position = len(self.names)
+        self.names.append(name)
+
+        for key in self.blocking_keys(name):
+            self.blocks[key].append(position)
+
+    def candidates(self, name):
+        """ Returns the indexed names that share at least one block with name, in insertion order. """
+        positions = set()
+
+        for key in self.blocking_keys(name):
+            positions.update(self.blocks.get(key, ()))
+
+        return [ self.names[x] for x in sorted(positions) ]
+
+    def score(self, name, candidate):
+        """ How well two names in the same block match; by default, the cleaver's compare(). """
+        return self.cleaver_class.compare(name, candidate) or 0
+
+    def query(self, name, min_score=0):
+        """
+        Scores name against its candidates and returns a list of
+        (score, candidate) pairs scoring at least min_score, best first.
+        Ties keep insertion order.
+        """
+        matches = []
+
+        for candidate in self.candidates(name):
+            score = self.score(name, candidate)
+            if score >= min_score:
+                matches.append((score, candidate))
+
+        matches.sort(key=itemgetter(0), reverse=True)
+        return matches
+
+
+class PersonNameIndex(NameIndex):
+    """ Blocks people on their lowercased last name. """
+    cleaver_class = IndividualNameCleaver
+
+    def blocking_keys(self, name):
+        if isinstance(name, PersonName) and name.last:
+            return [ name.last.lower() ]
+        return []
+
+    def refining_keys(self, name):
+        """ The first initial, plus the first name's nickname groups. """
+        if not name.first:
+            return [ '' ]
+        return [ name.first[0].lower() ] + list(self.cleaver_class.nickname_index.group(name.first))
+
+
+class PhoneticPersonNameIndex(PersonNameIndex):
+    """
+    Blocks people on the phonetic encoding of their last name, so that
+    misspelled surnames ("Pelosi" and "Peloci") land in the same block.
+
+    compare() gives nothing to names whose last names differ, so a pair whose
+    last names only sound alike is scored as though they were spelled the
+    same, less misspelling_penalty.
+    """
+    encoding = 'metaphone'
+    misspelling_penalty = 0.5
+
+    def blocking_keys(self, name):
+        if isinstance(name, PersonName) and name.last:
+            key = name.phonetic_key('last', self.encoding)
+            return [ key or name.last.lower() ]
+        return []
+
+    def score(self, name, candidate):
+        if name.last == candidate.last:
+            return super(PhoneticPersonNameIndex, self).score(name, candidate)
+
+        respelled = candidate.copy()
+        respelled.last = name.last
+        return max(0, super(PhoneticPersonNameIndex, self).score(name, respelled) - self.misspelling_penalty)
+
+
+class OrganizationNameIndex(NameIndex):
+    """
+    Blocks organizations on each word of their kernel, or on the whole expanded
+    name when the kernel is empty (e.g. "The Group").
+    """
+    cleaver_class = OrganizationNameCleaver
+
+    def blocking_keys(self, name):
+        if not isinstance(name, OrganizationName) or not name.name:
+            return []
+
+        kernel = name.kernel().lower().split()
+        if kernel:
+            return set(kernel)
+
+        return [ name.expand().lower() ]
+
+    def refining_keys(self, name):
+        """ Apart from CRP-style partner lists, only names with the same kernel score above 2. """
+        return [ name.kernel().lower() ]
@@ -0,0 +1,221 @@
+"""
+Approximate matching of organization names by MinHash and locality-sensitive
+hashing, for finding near-duplicates ("Lockheed Martin Corp" and
+"Lockheed-Martin Aeronautics") that compare() scores no better than
+unrelated names, without scanning every pair.
+
+Each name is reduced to the set of character shingles of its kernel, and
+that set to a MinHash signature: num_perm minimum hash values, any one of
+which two names share with probability equal to the Jaccard similarity of
+their shingle sets. The signature is cut into bands of rows; names sharing
+every row of any band are candidates for each other. A pair with similarity
+s becomes a candidate with probability 1 - (1 - s ** rows) ** bands, an
+S-curve whose midpoint is roughly (1 / bands) ** (1 / rows):
+
+    num_perm  bands  rows  midpoint
+          64     32     2      0.18
+          64     16     4      0.50
+         128     32     4      0.42
+         128     16     8      0.71
+
+More bands (fewer rows each) raise recall at the cost of more candidates to
+check; fewer, wider bands raise precision. Candidates are then filtered on
+their estimated similarity (the fraction of signature values they share).
+"""
+from array import array
+from collections import defaultdict
+from itertools import combinations, izip
+import random
+import zlib
+from names import OrganizationName
+import patterns
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def shingle_text(name):
+    """
+    The text shingled for a name: its kernel (or, if that's empty, its expanded
+    form) lowercased, with runs of punctuation and whitespace collapsed to a
+    single space and padded at either end, so word boundaries count too.
+    """
+    text = name.kernel() or name.expand()
+    text = patterns.SHINGLE_SEPARATOR.sub(' ', text.lower()).strip()
+    return ' %s ' % text if text else ''
+
+
+def shingles(text, size):
+    if len(text) <= size:
+        return set([ text ]) if text.strip() else set()
+    return set(text[i:i + size] for i in xrange(len(text) - size + 1))
+
+
+class MinHashIndex(object):
+    """
+    An LSH index over OrganizationName objects. Anything else added (e.g. the
+    string safe mode returns for a name it couldn't parse) keeps its position
+    in names but is never matched.
+
+        index = MinHashIndex(registry, num_perm=128, bands=32)
+        for similarity, match in index.query(OrganizationNameCleaver(employer).parse(), min_similarity=0.5):
+            ...
+    """
+    max_cached_shingles = 50000
+
+    def __init__(self, names=(), num_perm=64, bands=16, shingle_size=3, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm ({0}) must be a multiple of bands ({1}).".format(num_perm, bands))
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm / bands
+        self.shingle_size = shingle_size
+
+        rnd = random.Random(seed)
+        self.permutations = [ (rnd.randint(1, MERSENNE_PRIME - 1), rnd.randint(0, MERSENNE_PRIME - 1)) for x in xrange(num_perm) ]
+        self.shingle_hashes = {}
+
+        self.names = []
+        self.signatures = []
+        # each position's key in every band (None for names that aren't matched)
+        self.keys = []
+        self.buckets = [ defaultdict(list) for x in xrange(bands) ]
+
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def threshold(self):
+        """ The similarity at which a pair is about as likely as not to become a candidate. """
+        return (1.0 / self.bands) ** (1.0 / self.rows)
+
+    def hash_shingle(self, shingle):
+        """ The shingle's value under each of the num_perm hash functions, cached since shingles recur constantly. """
+        try:
+            return self.shingle_hashes[shingle]
+        except KeyError:
+            if len(self.shingle_hashes) >= self.max_cached_shingles:
+                self.shingle_hashes.clear()
+
+            if isinstance(shingle, unicode):
+                base = zlib.crc32(shingle.encode('utf-8')) & MAX_HASH
+            else:
+                base = zlib.crc32(shingle) & MAX_HASH
+
+            hashes = self.shingle_hashes[shingle] = tuple([ ((a * base + b) % MERSENNE_PRIME) & MAX_HASH for a, b in self.permutations ])
+            return hashes
+
+    def signature(self, name):
+        """ The MinHash signature of name, or None if it has nothing to shingle. """
+        if not isinstance(name, OrganizationName) or not name.name:
+            return None
+
+        pieces = shingles(shingle_text(name), self.shingle_size)
+        if not pieces:
+            return None
+
+        return array('I', map(min, zip(*[ self.hash_shingle(x) for x in pieces ])))
+
+    def band_keys(self, signature):
+        rows = self.rows
+        return [ hash(tuple(signature[i * rows:(i + 1) * rows])) for i in xrange(self.bands) ]
+
+    def add(self, name):
+        position = len(self.names)
+        signature = self.signature(name)
+        keys = self.band_keys(signature) if signature is not None else None
+
+        self.names.append(name)
+        self.signatures.append(signature)
+        self.keys.append(keys)
+
+        if keys is not None:
+            for buckets, key in izip(self.buckets, keys):
+                buckets[key].append(position)
+
+        return position
+
+    def similarity(self, a, b):
+        """ The estimated Jaccard similarity of two signatures. """
+        return sum(1 for x, y in izip(a, b) if x == y) / float(self.num_perm)
+
+    def candidates(self, signature):
+        positions = set()
+
+        for buckets, key in izip(self.buckets, self.band_keys(signature)):
+            positions.update(buckets.get(key, ()))
+
+        return positions
+
+    def query(self, name, min_similarity=0.5, limit=None):
+        """
+        Returns (similarity, candidate) pairs for the indexed names likely to
+        resemble name, with an estimated similarity of at least min_similarity,
+        most similar first (ties in insertion order).
+        """
+        signature = self.signature(name)
+        if signature is None:
+            return []
+
+        matches = []
+        for position in sorted(self.candidates(signature)):
+            similarity = self.similarity(signature, self.signatures[position])
+            if similarity >= min_similarity:
+                matches.append((similarity, self.names[position]))
+
+        matches.sort(key=lambda x: x[0], reverse=True)
+        return matches[:limit] if limit is not None else matches
+
+    def self_join(self, min_similarity=0.5):
+        """
+        Yields (i, j, similarity) once for every pair of positions i < j in
+        names whose estimated similarity is at least min_similarity.
+
+        Only pairs sharing a bucket are checked, each in the first band where
+        they share one, so nothing is kept from one pair to the next. The cost
+        is the number of pairs sharing a bucket: far fewer than all pairs when
+        buckets are small, but a name repeated n times makes n * (n - 1) / 2
+        pairs, all of which are yielded. For duplicate-heavy data, index each
+        distinct name (or kernel) once and fan the matches back out.
+        """
+        for band, buckets in enumerate(self.buckets):
+            for bucket in buckets.itervalues():
+                for i, j in self.unchecked_pairs(band, bucket):
+                    similarity = self.similarity(self.signatures[i], self.signatures[j])
+                    if similarity >= min_similarity:
+                        yield i, j, similarity
+
+    def unchecked_pairs(self, band, bucket):
+        """ The pairs (i, j), i < j, in a bucket of band that don't share a bucket in any earlier band. """
+        if band == 0:
+            return combinations(bucket, 2)
+
+        # pairs sharing a bucket in the first band are skipped a group at a time,
+        # which is where duplicates end up; the rest are checked one by one
+        groups = defaultdict(list)
+        for position in bucket:
+            groups[self.keys[position][0]].append(position)
+
+        if len(groups) == 1:
+            return ()
+
+        return self.unshared_pairs(band, groups.values())
+
+    def unshared_pairs(self, band, groups):
+        keys = self.keys
+
+        for g, group in enumerate(groups):
+            for other in groups[g + 1:]:
+                for a in group:
+                    keys_a = keys[a]
+                    for b in other:
+                        keys_b = keys[b]
+                        for earlier in xrange(1, band):
+                            if keys_a[earlier] == keys_b[earlier]:
+                                break
+                        else:
+                            yield (a, b) if a < b else (b, a)
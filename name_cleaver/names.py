@@ -1,10 +1,99 @@
-import re
+from functools import wraps
+import patterns
+from patterns import DEGREE_RE, SUFFIX_RE
+from phrases import PhraseMatcher, read_table
+from casing import CaseRestorer, read_exceptions
+import phonetics
+from tokens import TokenClassifier, HONORIFIC, SUFFIX, DEGREE, NICKNAME, FAMILY_NAME_PREFIX
+
+
+def derived_form(method):
+    """
+    Caches the result of a method computed purely from self.name. The cache is
+    thrown away as soon as self.name is replaced (as case_name_parts does), so
+    callers always see forms derived from the current name.
+    """
+    form = method.__name__
+
+    @wraps(method)
+    def cached(self):
+        if self.derived_from is not self.name:
+            self.derived_forms = {}
+            self.derived_from = self.name
+
+        try:
+            return self.derived_forms[form]
+        except KeyError:
+            value = self.derived_forms[form] = method(self)
+            return value
+
+    return cached
+
+
+slots_by_class = {}
+
+def all_slots(cls):
+    """ The names of every slot declared by cls and its ancestors. """
+    try:
+        return slots_by_class[cls]
+    except KeyError:
+        slots = slots_by_class[cls] = tuple(slot for klass in reversed(cls.__mro__) for slot in klass.__dict__.get('__slots__', ()))
+        return slots
+
+
+phrase_matchers_by_class = {}
+
+def phrase_matchers(cls):
+    """
+    The (expansions, stop_phrases) PhraseMatchers for an OrganizationName
+    class, compiled from its abbreviations (and abbreviation_files) and
+    stop_words the first time they're needed. Each subclass gets its own,
+    so a subclass can bring its own abbreviations without touching anyone
+    else's.
+    """
+    try:
+        return phrase_matchers_by_class[cls]
+    except KeyError:
+        abbreviations = dict(cls.abbreviations)
+        for path in cls.abbreviation_files:
+            abbreviations.update(read_table(path))
+
+        matchers = phrase_matchers_by_class[cls] = (PhraseMatcher(abbreviations),
+                PhraseMatcher(dict.fromkeys(cls.stop_words)))
+        return matchers
+
+
+case_restorers_by_class = {}
+
+def case_restorer(cls):
+    """
+    The CaseRestorer for a Name class, built from its case_exceptions (and
+    case_exception_files) and scottish_re the first time it's needed, one per
+    class like the phrase matchers.
+    """
+    try:
+        return case_restorers_by_class[cls]
+    except KeyError:
+        restorer = CaseRestorer(cls.case_exceptions, cls.scottish_re)
+        for path in cls.case_exception_files:
+            restorer.update(read_exceptions(path))
+
+        case_restorers_by_class[cls] = restorer
+        return restorer
 
-DEGREE_RE = 'j\.?d\.?|m\.?d\.?|ph\.?d\.?'
-SUFFIX_RE = '([js]r\.?|%s|[IVX]{2,})' % DEGREE_RE
 
 class Name(object):
-    scottish_re = r'(?i)\b(?P<mc>ma?c)(?!hin)(?P<first_letter>\w)\w+'
+    # names are held by the million, so they're slotted rather than carrying a __dict__ each
+    __slots__ = ()
+
+    scottish_re = patterns.SCOTTISH
+    # words spelled in a way title-casing can't get right ('DeLauro', 'AFL-CIO'),
+    # restored as given when a name's case is fixed; files (one spelling per
+    # line, see casing.read_exceptions) are read the first time they're needed
+    case_exceptions = ()
+    case_exception_files = ()
+    # slots holding values cached from the others, which needn't be saved
+    transient_slots = ()
 
     def primary_name_parts(self):
         raise NotImplementedError("Subclasses of Name must implement primary_name_parts.")
@@ -13,23 +102,46 @@ class Name(object):
         return ' '.join([ x for x in self.primary_name_parts() if x ])
 
     def is_mixed_case(self):
-        return re.search(r'[A-Z][a-z]', self.non_empty_primary_name_parts())
+        return patterns.MIXED_CASE.search(self.non_empty_primary_name_parts())
 
     def uppercase_the_scots(self, name_portion):
-        matches = re.search(self.scottish_re, name_portion)
+        matches = self.scottish_re.search(name_portion)
 
         if matches:
             mc = matches.group('mc')
             first_letter = matches.group('first_letter')
-            return re.sub(mc + first_letter, mc.title() + first_letter.upper(), name_portion)
+            return name_portion.replace(mc + first_letter, mc.title() + first_letter.upper())
         else:
             return name_portion
 
     def fix_case_for_possessives(self, name):
-        return re.sub(r"(\w+)'S\b", "\\1's", name)
+        return patterns.POSSESSIVE.sub("\\1's", name)
+
+    def copy(self):
+        """ Returns a new name with the same parts. Name parts are strings, so a shallow copy will do. """
+        duplicate = object.__new__(type(self))
+
+        for slot in all_slots(type(self)):
+            setattr(duplicate, slot, getattr(self, slot))
+
+        if hasattr(self, '__dict__'):
+            duplicate.__dict__.update(self.__dict__)
+
+        return duplicate
+
+    def __getstate__(self):
+        state = dict((slot, getattr(self, slot)) for slot in all_slots(type(self)))
+        state.update(getattr(self, '__dict__', ()))
+        return state
+
+    def __setstate__(self, state):
+        for attr, value in state.iteritems():
+            setattr(self, attr, value)
 
 
 class OrganizationName(Name):
+    # keys may be several words long ('elec wkrs'); they're matched a whole word
+    # at a time against the name with its punctuation removed
     abbreviations = {
         'acad': 'Academy',
         'assns': 'Associations',
@@ -61,28 +173,32 @@ class OrganizationName(Name):
         'amer': 'American',
         'ed': 'Educational',
     }
+    # tables of further abbreviations (see phrases.read_table), read the first
+    # time a name of the class is expanded; later files win
+    abbreviation_files = ()
     filler_words = 'The And Of In For Group'.split()
 
-    name = None
+    # words and phrases left out of the kernel; subclasses that change
+    # abbreviations or filler_words should rebuild this the same way
+    stop_words = frozenset(y.lower() for y in abbreviations.values() + filler_words)
+
+    __slots__ = ('name', 'derived_forms', 'derived_from')
+    transient_slots = ('derived_forms', 'derived_from')
 
     #suffix = None
 
+    def __init__(self):
+        self.name = None
+        self.derived_forms = None
+        self.derived_from = None
+
     def new(self, name):
         self.name = name
         return self
 
     def case_name_parts(self):
         if not self.is_mixed_case():
-            self.name = self.name.title()
-            self.name = self.uppercase_the_scots(self.name)
-
-            if re.match(r'(?i)^\w*PAC$', self.name):
-                self.name = self.name.upper() # if there's only one word that ends in PAC, make the whole thing uppercase
-            else:
-                self.name = re.sub(r'(?i)\bpac\b', 'PAC', self.name) # otherwise just uppercase the PAC part
-
-            self.name = self.uppercase_the_scots(self.name)
-            self.name = self.fix_case_for_possessives(self.name)
+            self.name = case_restorer(type(self)).restore(self.name, scots=True, pac=True, possessives=True)
 
         return self
 
@@ -95,13 +211,14 @@ class OrganizationName(Name):
     def __str__(self):
         return unicode(self.name).encode('utf-8')
 
+    @derived_form
     def without_extra_phrases(self):
         """Removes parenthethical and dashed phrases"""
         # the last parenthesis is optional, because sometimes they are truncated
-        name = re.sub(r'\s*\([^)]*\)?\s*$', '', self.name)
-        name = re.sub(r'(?i)\s* formerly.*$', '', name)
-        name = re.sub(r'(?i)\s*and its affiliates$', '', name)
-        name = re.sub(r'\bet al\b', '', name)
+        name = patterns.strip_trailing_parenthetical(patterns.TRAILING_PARENTHETICAL, self.name)
+        name = patterns.FORMERLY.sub('', name)
+        name = patterns.AND_ITS_AFFILIATES.sub('', name)
+        name = patterns.ET_AL.sub('', name)
         
         # in some datasets, the name of an organization is followed by a hyphen and an abbreviated name, or a specific
         # department or geographic subdivision; we want to remove this extraneous stuff without breaking names like
@@ -114,28 +231,26 @@ class OrganizationName(Name):
             # AND isn't either a number (often occurs in Union names) or a single letter (e.g., Tech-X),
             # AND the hyphen is preceded by either whitespace or at least four characters,
             # discard the hyphen and whatever follows
-            if len(hyphen_parts[1]) < len(hyphen_parts[0]) and re.search(r'(\w{4,}|\s+)$', hyphen_parts[0]) and not re.match(r'^([a-zA-Z]|[0-9]+)$', hyphen_parts[1]):
+            if len(hyphen_parts[1]) < len(hyphen_parts[0]) and patterns.HYPHEN_PREFIX_END.search(hyphen_parts[0]) and not patterns.HYPHEN_SUFFIX_EXEMPT.match(hyphen_parts[1]):
                 name = hyphen_parts[0].strip()
 
         return name
 
+    @derived_form
     def without_punctuation(self):
-        name = re.sub(r'/', ' ', self.without_extra_phrases())
-        return re.sub(r'[,.*:;+]*', '', name)
+        name = self.without_extra_phrases().replace('/', ' ')
+        return patterns.PUNCTUATION.sub('', name)
 
+    @derived_form
     def expand(self):
-        return ' '.join(self.abbreviations.get(w.lower(), w) for w in self.without_punctuation().split())
+        expansions = phrase_matchers(type(self))[0]
+        return ' '.join(expansions.apply(self.without_punctuation().split()))
 
+    @derived_form
     def kernel(self):
         """ The 'kernel' is an attempt to get at just the most pithy words in the name """
-        stop_words = [ y.lower() for y in self.abbreviations.values() + self.filler_words ]
-        kernel = ' '.join([ x for x in self.expand().split() if x.lower() not in stop_words ])
-
-        # this is a hack to get around the fact that this is the only two-word phrase we want to block
-        # amongst our stop words. if we end up with more, we may need a better way to do this
-        kernel = re.sub(r'\s*United States', '', kernel)
-
-        return kernel
+        stop_phrases = phrase_matchers(type(self))[1]
+        return ' '.join(stop_phrases.apply(self.expand().split()))
 
     def crp_style_firm_name(self, with_et_al=True):
         if with_et_al:
@@ -144,17 +259,27 @@ class OrganizationName(Name):
             return ', '.join(self.kernel().split()[0:2])
 
 
+STOP_WORDS = OrganizationName.stop_words
+
+
 class PersonName(Name):
-    honorific = None
-    first = None
-    middle = None
-    last = None
-    suffix = None
-    nick = None
+    __slots__ = ('honorific', 'first', 'middle', 'last', 'suffix', 'nick', 'phonetic_keys')
+    transient_slots = ('phonetic_keys',)
 
     family_name_prefixes = ('de', 'di', 'du', 'la', 'van', 'von')
+    # subclasses that change family_name_prefixes need their own classifier too
+    token_classifier = TokenClassifier(family_name_prefixes)
     allowed_honorifics = ['mrs', 'mrs.']
 
+    def __init__(self):
+        self.honorific = None
+        self.first = None
+        self.middle = None
+        self.last = None
+        self.suffix = None
+        self.nick = None
+        self.phonetic_keys = None
+
     def new(self, first, last, **kwargs):
         self.first = first.strip()
         self.last = last.strip()
@@ -195,12 +320,14 @@ class PersonName(Name):
         """
 
         if kwargs.get('allow_quoted_nicknames'):
-            args = [ x.strip() for x in args if not re.match(r'^[(]', x) ]
+            args = [ x.strip() for x in args if not x.startswith('(') ]
         else:
-            args = [ x.strip() for x in args if not re.match(r'^[("]', x) ]
+            args = [ x.strip() for x in args if not x.startswith(('(', '"')) ]
+
+        kinds = self.token_classifier.classify_all(args)
 
         if len(args) > 2:
-            self.detect_and_fix_two_part_surname(args)
+            self.detect_and_fix_two_part_surname(args, kinds)
 
         # set defaults
         self.first = ''
@@ -208,15 +335,18 @@ class PersonName(Name):
 
         # the final few tokens should always be detectable, otherwise a last name
         if len(args):
-            if self.is_an_honorific(args[-1]):
+            if kinds[-1] is HONORIFIC:
+                kinds.pop()
                 self.honorific = args.pop()
                 if not self.honorific[-1] == '.':
                     self.honorific += '.'
-            if self.is_a_suffix(args[-1]):
+            if kinds[-1] in (SUFFIX, DEGREE):
+                kinds.pop()
                 self.suffix = args.pop()
-                if re.match(r'[js]r(?!\.)', self.suffix, re.IGNORECASE):
+                if self.suffix.lower() in ('jr', 'sr'):
                     self.suffix += '.'
-            if self.is_a_nickname(args[-1]):
+            if kinds[-1] is NICKNAME:
+                kinds.pop()
                 self.nick = args.pop()
             self.last = args.pop()
 
@@ -242,27 +372,57 @@ class PersonName(Name):
         return self
 
     def is_a_suffix(self, name_part):
-        return re.match(r'^%s$' % SUFFIX_RE, name_part, re.IGNORECASE)
+        return patterns.SUFFIX_TOKEN.match(name_part)
 
     def is_an_honorific(self, name_part):
-        return re.match(r'^\s*[dm][rs]s?[.,]?\s*$', name_part, re.IGNORECASE)
+        return patterns.HONORIFIC_TOKEN.match(name_part)
 
     def is_a_nickname(self, name_part):
         """
         Nicknames, in our data, often come wrapped in parentheses or the like. This detects those.
         """
-        return re.match(r'^["(].*[")]$', name_part)
+        return patterns.NICKNAME_TOKEN.match(name_part)
+
+    def phonetic_key(self, part='last', encoding='metaphone'):
+        """
+        The phonetic encoding ('metaphone' or 'soundex') of one part of the
+        name, such as 'last' or 'first', or None if that part is empty.
+        Computed the first time it's asked for, and again only if the part changes.
+        """
+        value = getattr(self, part)
+        if not value:
+            return None
+
+        if self.phonetic_keys is None:
+            self.phonetic_keys = {}
 
-    def detect_and_fix_two_part_surname(self, args):
+        try:
+            encoded_value, key = self.phonetic_keys[part, encoding]
+            if encoded_value is value:
+                return key
+        except KeyError:
+            pass
+
+        key = phonetics.encode(value, encoding)
+        self.phonetic_keys[part, encoding] = (value, key)
+        return key
+
+    def detect_and_fix_two_part_surname(self, args, kinds=None):
         """
         This detects common family name prefixes and joins them to the last name,
         so names like "De Kuyper" don't end up with "De" as a middle name.
+
+        If the tokens' kinds are passed in, they're kept in step with args.
         """
+        if kinds is None:
+            kinds = self.token_classifier.classify_all(args)
+
         i = 0
         while i < len(args) - 1:
-            if args[i].lower() in self.family_name_prefixes:
+            if kinds[i] is FAMILY_NAME_PREFIX:
                 args[i] = ' '.join(args[i:i+2])
                 del(args[i+1])
+                kinds[i:i+2] = [ self.token_classifier.classify(args[i]) ]
                 break
             else:
                 i += 1
@@ -288,22 +448,21 @@ class PersonName(Name):
         Convert all the parts of the name to the proper case... carefully!
         """
         if not self.is_mixed_case():
-            self.honorific = self.honorific.title() if self.honorific else None
-            self.nick = self.nick.title() if self.nick else None
+            restore = case_restorer(type(self)).restore
+            self.honorific = restore(self.honorific) if self.honorific else None
+            self.nick = restore(self.nick) if self.nick else None
 
             if self.first:
-                self.first = self.first.title()
-                self.first = self.capitalize_and_punctuate_initials(self.first)
+                self.first = self.capitalize_and_punctuate_initials(restore(self.first))
 
             if self.last:
-                self.last = self.last.title()
-                self.last = self.uppercase_the_scots(self.last)
+                self.last = restore(self.last, scots=True)
 
-            self.middle = self.middle.title() if self.middle else None
+            self.middle = restore(self.middle) if self.middle else None
 
             if self.suffix:
                 # Title case Jr/Sr, but uppercase roman numerals
-                if re.match(r'(?i).*[js]r', self.suffix):
+                if patterns.JR_OR_SR.match(self.suffix):
                     self.suffix = self.suffix.title()
                 else:
                     self.suffix = self.suffix.upper()
@@ -315,7 +474,7 @@ class PersonName(Name):
         Let's assume we have a name like "B.J." if the name is two to three
         characters and consonants only.
         """
-        return re.match(r'(?i)[^aeiouy]{2,3}$', name_part)
+        return patterns.ONLY_INITIALS.match(name_part)
 
     def capitalize_and_punctuate_initials(self, name_part):
         if self.is_only_initials(name_part):
@@ -340,6 +499,8 @@ class PersonName(Name):
 
 
 class PoliticalMetadata(object):
+    __slots__ = ()
+
     party = None
     state = None
 
@@ -358,7 +519,12 @@ class PoliticalMetadata(object):
 
 
 class PoliticianName(PoliticalMetadata, PersonName):
-    pass
+    __slots__ = ('party', 'state')
+
+    def __init__(self):
+        super(PoliticianName, self).__init__()
+        self.party = None
+        self.state = None
 
 
 class RunningMatesNames(PoliticalMetadata):
@@ -376,6 +542,11 @@ class RunningMatesNames(PoliticalMetadata):
     def mates(self):
         return [ self.mate1, self.mate2 ]
 
+    def copy(self):
+        duplicate = RunningMatesNames(self.mate1.copy(), self.mate2.copy())
+        duplicate.__dict__.update((k, v) for k, v in self.__dict__.iteritems() if k not in ('mate1', 'mate2'))
+        return duplicate
+
     def is_mixed_case(self):
         for mate in self.mates():
             if mate.is_mixed_case():
@@ -1,3 +1,5 @@
+import codecs
+
 # List of names which can be equated with each other
 # Do not put names that cannot be considered equivalent
 # in the same tuple, even if they have the same nickname.
@@ -72,3 +74,101 @@ NICKNAMES = (
     ('William', 'Bill', 'Billy', 'Will', 'Willy'),
     ('Willis', 'Will'),
 )
+
+
+def read_groups(path):
+    """
+    Reads nickname groups from a UTF-8 text file with one group per line,
+    its names separated by commas:
+
+        # first names that can stand in for each other
+        Robert, Rob, Robby, Bobby, Bob
+        William, Bill, Billy, Will, Willy
+
+    Blank lines and lines starting with # are skipped.
+    """
+    with codecs.open(path, encoding='utf-8') as lines:
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            group = tuple(x.strip() for x in line.split(',') if x.strip())
+            if group:
+                yield group
+
+
+class NicknameIndex(object):
+    """
+    Maps each first name, case-insensitively, to the ids of the nickname groups
+    it appears in, so that checking whether two names are interchangeable is a
+    couple of dictionary lookups instead of a scan over every group. A group's
+    id is its position in the sequence the index was built from.
+    """
+    no_groups = frozenset()
+
+    def __init__(self, groups):
+        self.index = self.build(groups)
+
+    @classmethod
+    def from_file(cls, path, include_defaults=True):
+        """ An index of the groups in a file (see read_groups), after the built-in NICKNAMES unless told otherwise. """
+        return cls(list(NICKNAMES if include_defaults else ()) + list(read_groups(path)))
+
+    def build(self, groups):
+        index = {}
+
+        for group_id, group in enumerate(groups):
+            for name in group:
+                index.setdefault(name.lower(), set()).add(group_id)
+
+        # most names are in just one group, and many share the same groups, so
+        # equal sets of ids are stored once
+        interned = {}
+        return dict((name, interned.setdefault(frozenset(ids), frozenset(ids))) for name, ids in index.iteritems())
+
+    def __len__(self):
+        return len(self.index)
+
+    def group(self, name):
+        if not name:
+            return self.no_groups
+
+        return self.index.get(name.lower(), self.no_groups)
+
+    def are_equivalent(self, name1, name2):
+        return not self.group(name1).isdisjoint(self.group(name2))
+
+
+class LazyNicknameIndex(NicknameIndex):
+    """
+    A NicknameIndex of the groups in a file that isn't read until the first
+    lookup, so a large nickname database can be configured at import time
+    for free:
+
+        IndividualNameCleaver.nickname_index = LazyNicknameIndex('nicknames.txt')
+    """
+
+    def __init__(self, path, include_defaults=True):
+        self.path = path
+        self.include_defaults = include_defaults
+
+    def __getattr__(self, attr):
+        # only called while there's no index attribute yet; once built, it's an ordinary attribute
+        if attr == 'index':
+            self.index = NicknameIndex.from_file(self.path, self.include_defaults).index
+            return self.index
+        raise AttributeError(attr)
+
+
+NICKNAME_INDEX = NicknameIndex(NICKNAMES)
+
+
+def nickname_group(name):
+    """ Returns the ids of the nickname groups the name belongs to (possibly none). """
+    return NICKNAME_INDEX.group(name)
+
+
+def are_nickname_equivalent(name1, name2):
+    """ True if the two names appear together in at least one nickname group. """
+    return NICKNAME_INDEX.are_equivalent(name1, name2)
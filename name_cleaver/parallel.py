@@ -0,0 +1,44 @@
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+from records import parse_records
+
+
+def chunked(strings, chunk_size):
+    iterator = iter(strings)
+
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_many(cleaver_class, strings, workers=None, chunk_size=1000):
+    """
+    Parses an iterable of strings with cleaver_class across a pool of worker
+    processes, yielding a PersonRecord or OrganizationRecord for each string in
+    input order. Parsing is done in safe mode; unparseable inputs come back
+    with ok set to False.
+
+    Only a few chunks per worker are in flight at any time, so the input may be
+    an arbitrarily long stream.
+    """
+    workers = workers or cpu_count()
+    pool = Pool(workers)
+    pending = deque()
+
+    try:
+        for chunk in chunked(strings, chunk_size):
+            pending.append(pool.apply_async(parse_records, (cleaver_class, chunk)))
+
+            if len(pending) > workers * 2:
+                for record in pending.popleft().get():
+                    yield record
+
+        while pending:
+            for record in pending.popleft().get():
+                yield record
+    finally:
+        pool.terminate()
+        pool.join()
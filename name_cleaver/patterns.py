@@ -0,0 +1,97 @@
+import re
+
+DEGREE_RE = 'j\.?d\.?|m\.?d\.?|ph\.?d\.?'
+SUFFIX_RE = '([js]r\.?|%s|[IVX]{2,})' % DEGREE_RE
+
+# Every regular expression used while parsing or casing a name is compiled
+# here, once, at import time. The registry maps a rule name to its compiled
+# pattern so that the rules can be enumerated (for instrumentation, say)
+# without having to know which module uses them.
+PATTERNS = {}
+
+
+# None of them should take more than linear time in the length of the name:
+# a search tries every starting position, so a pattern mustn't be able to
+# rescan a long run (of spaces, say, or letters) from each position in it.
+# Where a leading \s* or \w+ would, (?<!\s) or \b makes only the start of
+# the run a candidate, which doesn't change what matches.
+
+
+def register(rule, pattern, flags=0):
+    compiled = re.compile(pattern, flags)
+    PATTERNS[rule] = compiled
+    return compiled
+
+
+# individual and politician names
+PARENTHETICAL_PADDING = register('parenthetical_padding', r'\(\s*([^)]+)\s*\)')
+TRAILING_AND_MRS = register('trailing_and_mrs', r' \& mrs\.?$', re.IGNORECASE)
+HONORIFIC = register('honorific', r'\b(?P<honorific>[dm][rs]s?[,.]?)(?=\b|\s)', re.IGNORECASE)
+JUNK_NUMBERS = register('junk_numbers', r'(?P<junk_numbers>\b\d{2,}(?=\b|\s))', re.IGNORECASE)
+DIGIT_PAIR = register('digit_pair', r'\d\d')
+QUOTED_NICKNAME = register('quoted_nickname', r'("[^"]+")', re.IGNORECASE)
+TRAILING_NON_ALPHANUMERIC = register('trailing_non_alphanumeric', r'[^a-zA-Z0-9]$')
+SUFFIX = register('suffix', r'\b(?P<suffix>{})(?=\b|\s|\Z|\W)'.format(SUFFIX_RE), re.IGNORECASE)
+DEGREE = register('degree', DEGREE_RE, re.IGNORECASE)
+LAST_FIRST_SEPARATOR = register('last_first_separator', r', ?')
+WHITESPACE = register('whitespace', r'\s+')
+PARTY = register('party', r'(?<!\s)\s*\([^)]+\)\s*$')
+RUNNING_MATES_SEPARATOR = register('running_mates_separator', r' [&/] ')
+# "First Last" or "First M. Last", already cased and with nothing to strip
+CLEAN_PERSON_NAME = register('clean_person_name', r'[A-Z][a-z]+ (?:[A-Z]\.? )?[A-Z][a-z]+\Z')
+
+# name tokens
+SUFFIX_TOKEN = register('suffix_token', r'^%s$' % SUFFIX_RE, re.IGNORECASE)
+HONORIFIC_TOKEN = register('honorific_token', r'^\s*[dm][rs]s?[.,]?\s*$', re.IGNORECASE)
+NICKNAME_TOKEN = register('nickname_token', r'^["(].*[")]$')
+
+# casing
+MIXED_CASE = register('mixed_case', r'[A-Z][a-z]')
+SCOTTISH = register('scottish', r'(?i)\b(?P<mc>ma?c)(?!hin)(?P<first_letter>\w)\w+')
+POSSESSIVE = register('possessive', r"\b(\w+)'S\b")
+SINGLE_WORD_PAC = register('single_word_pac', r'(?i)^\w*PAC$')
+PAC = register('pac', r'(?i)\bpac\b')
+JR_OR_SR = register('jr_or_sr', r'(?i).*[js]r')
+ONLY_INITIALS = register('only_initials', r'(?i)[^aeiouy]{2,3}$')
+
+# organization names
+TRAILING_PARENTHETICAL = register('trailing_parenthetical', r'(?<!\s)\s*\([^)]*\)?\s*$')
+FORMERLY = register('formerly', r'(?i)(?<!\s)\s* formerly.*$')
+AND_ITS_AFFILIATES = register('and_its_affiliates', r'(?i)(?<!\s)\s*and its affiliates$')
+ET_AL = register('et_al', r'\bet al\b')
+# a necessary condition for any of the four rules above (or the hyphen rule) to match
+EXTRA_PHRASE_HINT = register('extra_phrase_hint', r'(?i)[(-]|formerly|affiliates|et al')
+HYPHEN_PREFIX_END = register('hyphen_prefix_end', r'(?:\w{4}|\s)$')
+HYPHEN_SUFFIX_EXEMPT = register('hyphen_suffix_exempt', r'^([a-zA-Z]|[0-9]+)$')
+PUNCTUATION = register('punctuation', r'[,.*:;+]*')
+SHINGLE_SEPARATOR = register('shingle_separator', r'[\W_]+', re.UNICODE)
+# a word looked up among the case exceptions: word characters, and any
+# apostrophes and hyphens between them ("Delauro's", "Afl-Cio")
+CASE_EXCEPTION_WORD = register('case_exception_word', r"\w(?:[\w'-]*\w)?", re.UNICODE)
+
+
+# The parenthetical rules can also rescan: from every '(' in a run with no ')'
+# to close it, they'd read on to the end of the name. These only hand them
+# the part of the name where a match could be.
+
+def sub_parentheticals(pattern, replacement, name):
+    """ pattern.sub(replacement, name), for a pattern whose matches end with ')'. """
+    last = name.rfind(')')
+    if last == -1:
+        return name
+    return pattern.sub(replacement, name[:last + 1]) + name[last + 1:]
+
+
+def strip_trailing_parenthetical(pattern, name):
+    """
+    pattern.sub('', name), for PARTY or TRAILING_PARENTHETICAL, whose matches
+    run from a '(' to the end of the name with no ')' before the last
+    character (or trailing whitespace). Only what follows the ')' before that
+    is searched.
+    """
+    stripped = name.rstrip()
+    end = len(stripped) - 1 if stripped.endswith(')') else len(name)
+    before = name.rfind(')', 0, end)
+    if before == -1:
+        return pattern.sub('', name)
+    return name[:before + 1] + pattern.sub('', name[before + 1:])
@@ -0,0 +1,208 @@
+"""
+Phonetic encodings of names, for grouping spellings that sound alike
+("Pelosi" and "Peloci", "Smith" and "Smyth") under the same key.
+
+Two encodings are provided: American Soundex, which is coarse but standard,
+and Lawrence Philips' original Metaphone, which knows far more English
+spelling rules and so groups names more tightly. Both ignore case and
+anything that isn't a letter; accented letters are reduced to their base
+letter first.
+"""
+import unicodedata
+
+VOWELS = frozenset('AEIOU')
+FRONT_VOWELS = frozenset('EIY')
+# letters after which an H is silent
+H_MODIFIERS = frozenset('CSPTG')
+
+SOUNDEX_CODES = {}
+for letters, code in (('BFPV', '1'), ('CGJKQSXZ', '2'), ('DT', '3'), ('L', '4'), ('MN', '5'), ('R', '6')):
+    for letter in letters:
+        SOUNDEX_CODES[letter] = code
+
+
+def letters_only(word):
+    """ The word uppercased, with accents removed and anything but the letters A-Z dropped. """
+    if isinstance(word, unicode):
+        word = unicodedata.normalize('NFKD', word).encode('ascii', 'ignore')
+    return ''.join(x for x in word.upper() if 'A' <= x <= 'Z')
+
+
+def soundex(word):
+    """ The four-character American Soundex code of word, e.g. 'R163' for Robert and Rupert; '' if it has no letters. """
+    word = letters_only(word)
+    if not word:
+        return ''
+
+    code = [ word[0] ]
+    previous = SOUNDEX_CODES.get(word[0])
+
+    for letter in word[1:]:
+        digit = SOUNDEX_CODES.get(letter)
+        if digit and digit != previous:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        # H and W don't separate letters with the same code; vowels do
+        if letter not in 'HW':
+            previous = digit
+
+    return ''.join(code).ljust(4, '0')
+
+
+def metaphone(word, max_length=4):
+    """
+    The Metaphone key of word, e.g. 'PLS' for both Pelosi and Peloci, cut
+    to max_length characters ('0' stands for 'th', 'X' for 'sh' and 'ch').
+    """
+    word = letters_only(word)
+    if not word:
+        return ''
+
+    # initial letters that are silent or pronounced unusually
+    if word[:2] in ('AE', 'GN', 'KN', 'PN', 'WR'):
+        word = word[1:]
+    elif word[0] == 'X':
+        word = 'S' + word[1:]
+    elif word[:2] == 'WH':
+        word = 'W' + word[2:]
+
+    length = len(word)
+    at = lambda i: word[i] if 0 <= i < length else ''
+    key = []
+
+    for i, letter in enumerate(word):
+        if max_length and len(key) >= max_length:
+            break
+
+        previous, following = at(i - 1), at(i + 1)
+
+        # doubled letters sound once, except for C
+        if letter == previous and letter != 'C':
+            continue
+
+        if letter in VOWELS:
+            if i == 0:
+                key.append(letter)
+
+        elif letter == 'B':
+            if not (previous == 'M' and i == length - 1):
+                key.append('B')
+
+        elif letter == 'C':
+            if following == 'I' and at(i + 2) == 'A':
+                key.append('X')
+            elif following == 'H':
+                key.append('K' if previous == 'S' else 'X')
+            elif following in FRONT_VOWELS:
+                if previous != 'S':
+                    key.append('S')
+            else:
+                key.append('K')
+
+        elif letter == 'D':
+            key.append('J' if following == 'G' and at(i + 2) in FRONT_VOWELS else 'T')
+
+        elif letter == 'G':
+            if following == 'H' and at(i + 2) and at(i + 2) not in VOWELS:
+                continue
+            if following == 'N' and (i + 2 == length or word[i + 2:] == 'ED'):
+                continue
+            if previous == 'D' and following in FRONT_VOWELS:
+                continue
+            key.append('J' if following in FRONT_VOWELS and previous != 'G' else 'K')
+
+        elif letter == 'H':
+            if previous in H_MODIFIERS:
+                continue
+            if previous in VOWELS and following not in VOWELS:
+                continue
+            key.append('H')
+
+        elif letter == 'K':
+            if previous != 'C':
+                key.append('K')
+
+        elif letter == 'P':
+            key.append('F' if following == 'H' else 'P')
+
+        elif letter == 'Q':
+            key.append('K')
+
+        elif letter == 'S':
+            if following == 'H' or (following == 'I' and at(i + 2) in ('O', 'A')):
+                key.append('X')
+            else:
+                key.append('S')
+
+        elif letter == 'T':
+            if following == 'I' and at(i + 2) in ('O', 'A'):
+                key.append('X')
+            elif following == 'H':
+                key.append('0')
+            elif not (following == 'C' and at(i + 2) == 'H'):
+                key.append('T')
+
+        elif letter == 'V':
+            key.append('F')
+
+        elif letter in 'WY':
+            if following in VOWELS:
+                key.append(letter)
+
+        elif letter == 'X':
+            key.append('KS')
+
+        elif letter == 'Z':
+            key.append('S')
+
+        else:
+            # F, J, L, M, N and R sound as they're spelled
+            key.append(letter)
+
+    return ''.join(key)[:max_length] if max_length else ''.join(key)
+
+
+ENCODINGS = {
+    'soundex': soundex,
+    'metaphone': metaphone,
+}
+
+# names recur constantly, so encodings are remembered, up to this many (after which we start over)
+MAX_REMEMBERED = 100000
+remembered = dict((encoding, {}) for encoding in ENCODINGS)
+
+
+def encode(word, encoding='metaphone'):
+    codes = remembered[encoding]
+
+    try:
+        return codes[word]
+    except KeyError:
+        if len(codes) >= MAX_REMEMBERED:
+            codes.clear()
+        code = codes[word] = ENCODINGS[encoding](word)
+        return code
+
+
+def encode_many(words, encoding='metaphone'):
+    """
+    Encodes a whole column of words, each distinct word once. Anything that
+    isn't a string (e.g. None for a missing value) is encoded as None.
+    """
+    encoder = ENCODINGS[encoding]
+    codes = {}
+    encoded = []
+
+    for word in words:
+        if not isinstance(word, basestring):
+            encoded.append(None)
+            continue
+
+        try:
+            encoded.append(codes[word])
+        except KeyError:
+            code = codes[word] = encoder(word)
+            encoded.append(code)
+
+    return encoded
@@ -0,0 +1,96 @@
+"""
+Matches multi-word phrases against a list of words in one left-to-right pass.
+
+Phrases are compiled into a trie keyed by lowercased word, so each word is
+looked at once however many phrases there are, and a table of hundreds of
+abbreviations costs no more per word than a table of ten.
+"""
+import codecs
+
+# marks the end of a phrase in the trie; words are never None
+TERMINAL = None
+
+
+class PhraseMatcher(object):
+    """
+    Replaces each phrase in a list of words with its replacement, or drops it
+    if the replacement is None. Phrases are matched case-insensitively, a
+    whole word at a time, and where phrases overlap the longest one starting
+    at the earliest word wins.
+
+        >>> PhraseMatcher({ 'natl': 'National', 'elec wkrs': 'Electrical Workers', 'the': None }).apply('The Natl Elec Wkrs Union'.split())
+        ['National', 'Electrical Workers', 'Union']
+    """
+
+    def __init__(self, phrases):
+        self.trie = {}
+
+        for phrase, replacement in phrases.iteritems():
+            words = phrase.lower().split()
+            if not words:
+                continue
+
+            node = self.trie
+            for word in words:
+                node = node.setdefault(word, {})
+            node[TERMINAL] = replacement
+
+    def __len__(self):
+        return len(self.trie)
+
+    def apply(self, words):
+        trie = self.trie
+        lowered = [ x.lower() for x in words ]
+        count = len(words)
+        result = []
+        i = 0
+
+        while i < count:
+            node = trie.get(lowered[i])
+            matched_end = i
+
+            # walk as far down the trie as the words allow, remembering the longest complete phrase
+            j = i
+            while node is not None:
+                j += 1
+                if TERMINAL in node:
+                    matched_end, replacement = j, node[TERMINAL]
+                node = node.get(lowered[j]) if j < count else None
+
+            if matched_end == i:
+                result.append(words[i])
+                i += 1
+            else:
+                if replacement is not None:
+                    result.append(replacement)
+                i = matched_end
+
+        return result
+
+
+def read_table(path):
+    """
+    Reads a table of phrases and their replacements from a UTF-8 text file
+    with one tab-separated pair per line:
+
+        intl brotherhood of elec wkrs\tInternational Brotherhood of Electrical Workers
+        elec\tElectric
+
+    Blank lines and lines starting with # are skipped.
+    """
+    table = {}
+
+    with codecs.open(path, encoding='utf-8') as lines:
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            try:
+                phrase, replacement = line.split('\t')
+            except ValueError:
+                raise ValueError("{0}, line {1}: expected a phrase and its replacement separated by a tab".format(path, number))
+
+            table[phrase.strip().lower()] = replacement.strip()
+
+    return table
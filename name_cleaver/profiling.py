@@ -0,0 +1,129 @@
+from collections import defaultdict
+from functools import wraps
+from timeit import default_timer as timer
+from cleaver import IndividualNameCleaver
+from patterns import PATTERNS
+
+RULE_NAMES = dict((pattern, rule) for rule, pattern in PATTERNS.iteritems())
+
+
+class StageProfiler(object):
+    """
+    Records how long a cleaver spends in each stage of parsing, how often each
+    stage runs, and how often each extraction rule (honorific, suffix,
+    nickname and so on) finds a match.
+
+    Nothing is instrumented until the profiler is installed, which it is for
+    the duration of a with block:
+
+        profiler = StageProfiler(IndividualNameCleaver)
+        with profiler:
+            for name in names:
+                IndividualNameCleaver(name).parse(safe=True)
+        print profiler.report()
+
+    While installed, the stage methods on the cleaver class and its
+    object_class are replaced with timed wrappers, so subclasses (and their
+    name classes) are profiled too. Uninstalling puts the original methods
+    back, which means a profiler that isn't installed costs nothing at all.
+
+    Inputs built directly by parse_clean_name skip every other stage.
+
+    Times are cumulative and inclusive: separate_affixes and
+    reverse_last_first both include time spent in extract_suffix, and
+    convert_name_to_obj includes new_from_tokens.
+    """
+    cleaver_stages = ('parse_clean_name', 'pre_process', 'separate_affixes', 'extract_suffix', 'reverse_last_first', 'convert_name_to_obj')
+    name_stages = ('new_from_tokens', 'case_name_parts')
+
+    def __init__(self, cleaver_class=IndividualNameCleaver):
+        self.cleaver_class = cleaver_class
+        self.replaced = []
+        self.reset()
+
+    def reset(self):
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.rule_matches = defaultdict(int)
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def install(self):
+        if self.replaced:
+            return
+
+        targets = [ (self.cleaver_class, x) for x in self.cleaver_stages ] + \
+                [ (self.cleaver_class.object_class, x) for x in self.name_stages ]
+
+        for owner, stage in targets:
+            if hasattr(owner, stage):
+                self.replace(owner, stage, self.timed(stage, getattr(owner, stage)))
+
+        if hasattr(self.cleaver_class, 'extract_matching_portion'):
+            self.replace(self.cleaver_class, 'extract_matching_portion',
+                    self.counted(getattr(self.cleaver_class, 'extract_matching_portion')))
+
+    def uninstall(self):
+        while self.replaced:
+            owner, attr, original = self.replaced.pop()
+            if original is None:
+                delattr(owner, attr)
+            else:
+                setattr(owner, attr, original)
+
+    def replace(self, owner, attr, replacement):
+        self.replaced.append((owner, attr, owner.__dict__.get(attr)))
+        setattr(owner, attr, replacement)
+
+    def timed(self, stage, method):
+        calls, seconds = self.calls, self.seconds
+
+        @wraps(method)
+        def timed_stage(*args, **kwargs):
+            started = timer()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds[stage] += timer() - started
+                calls[stage] += 1
+
+        return timed_stage
+
+    def counted(self, method):
+        rule_matches = self.rule_matches
+
+        @wraps(method)
+        def counted_rule(cleaver, pattern, name):
+            name, matched_portion = method(cleaver, pattern, name)
+            if matched_portion is not None:
+                rule_matches[RULE_NAMES.get(pattern, pattern)] += 1
+            return name, matched_portion
+
+        return counted_rule
+
+    def stats(self):
+        return {
+            'stages': dict((stage, { 'calls': self.calls[stage], 'seconds': self.seconds[stage] }) for stage in self.calls),
+            'rule_matches': dict(self.rule_matches),
+        }
+
+    def report(self):
+        lines = [ '%-22s %10s %12s %12s' % ('stage', 'calls', 'total ms', 'per call us') ]
+
+        for stage in self.cleaver_stages + self.name_stages:
+            calls = self.calls.get(stage)
+            if calls:
+                lines.append('%-22s %10d %12.2f %12.2f' % (stage, calls, self.seconds[stage] * 1e3,
+                        self.seconds[stage] / calls * 1e6))
+
+        lines.append('')
+        lines.append('%-22s %10s' % ('rule', 'matches'))
+        for rule, matches in sorted(self.rule_matches.iteritems(), key=lambda x: -x[1]):
+            lines.append('%-22s %10d' % (rule, matches))
+
+        return '\n'.join(lines)
@@ -0,0 +1,40 @@
+from collections import namedtuple
+from itertools import izip
+from names import PersonName, RunningMatesNames, OrganizationName
+
+
+# Compact, immutable summaries of a parse result. Unlike the name objects the
+# cleavers return, these are cheap to pickle and to hold in bulk.
+PersonRecord = namedtuple('PersonRecord', 'first middle last suffix honorific nick cleaned ok')
+OrganizationRecord = namedtuple('OrganizationRecord', 'cleaned expanded kernel ok')
+
+
+def as_text(name):
+    return str(name).decode('utf-8')
+
+
+def to_record(cleaver_class, string, parsed):
+    """
+    Summarizes what cleaver_class's parse(safe=True) returned for string. Anything
+    other than a name object is treated as a failure, with the input kept as the
+    cleaned value, just as safe mode does.
+    """
+    if issubclass(cleaver_class.object_class, OrganizationName):
+        if isinstance(parsed, OrganizationName):
+            return OrganizationRecord(as_text(parsed), parsed.expand(), parsed.kernel(), True)
+        return OrganizationRecord(string, None, None, False)
+
+    if isinstance(parsed, PersonName):
+        return PersonRecord(parsed.first, parsed.middle, parsed.last, parsed.suffix,
+                parsed.honorific, parsed.nick, as_text(parsed), True)
+    elif isinstance(parsed, RunningMatesNames):
+        return PersonRecord(None, None, None, None, None, None, as_text(parsed), True)
+    return PersonRecord(None, None, None, None, None, None, string, False)
+
+
+def parse_records(cleaver_class, strings):
+    """ Parses a list of strings in safe mode, returning a list of records. """
+    # parse_many is run to the end (rather than zipped with strings, which stops
+    # early) so that it gets to flush the cleaver's parse cache
+    parsed = list(cleaver_class.parse_many(strings))
+    return [ to_record(cleaver_class, string, result) for string, result in izip(strings, parsed) ]
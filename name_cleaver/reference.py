@@ -0,0 +1,371 @@
+"""
+A frozen, deliberately plain copy of how the stock cleavers parse names,
+for checking optimizations against (see differential.py).
+
+Everything here is written out longhand: its own copies of the rules and
+tables, no caches, no fast paths, no token classifier or phrase trie, and
+no imports from the rest of the package beyond the record types. It must
+not change when the cleavers do. If a change to the cleavers' output is
+intended, change this module to match in the same commit, so the change is
+there to be reviewed.
+
+Each parse_* function takes an input string and returns the record that
+records.to_record would make of what the cleaver's parse(safe=True) returns.
+"""
+import re
+from records import PersonRecord, OrganizationRecord
+
+MAX_LENGTH = 1000
+MAX_TOKENS = 100
+
+DEGREE_RE = r'j\.?d\.?|m\.?d\.?|ph\.?d\.?'
+SUFFIX_RE = r'([js]r\.?|%s|[IVX]{2,})' % DEGREE_RE
+
+PARENTHETICAL_PADDING = re.compile(r'\(\s*([^)]+)\s*\)')
+TRAILING_AND_MRS = re.compile(r' \& mrs\.?$', re.IGNORECASE)
+HONORIFIC = re.compile(r'\b(?P<honorific>[dm][rs]s?[,.]?)(?=\b|\s)', re.IGNORECASE)
+JUNK_NUMBERS = re.compile(r'(?P<junk_numbers>\b\d{2,}(?=\b|\s))', re.IGNORECASE)
+QUOTED_NICKNAME = re.compile(r'("[^"]+")', re.IGNORECASE)
+TRAILING_NON_ALPHANUMERIC = re.compile(r'[^a-zA-Z0-9]$')
+SUFFIX = re.compile(r'\b(?P<suffix>{0})(?=\b|\s|\Z|\W)'.format(SUFFIX_RE), re.IGNORECASE)
+DEGREE = re.compile(DEGREE_RE, re.IGNORECASE)
+LAST_FIRST_SEPARATOR = re.compile(r', ?')
+WHITESPACE = re.compile(r'\s+')
+PARTY = re.compile(r'\s*\([^)]+\)\s*$')
+RUNNING_MATES_SEPARATOR = re.compile(r' [&/] ')
+
+SUFFIX_TOKEN = re.compile(r'^%s$' % SUFFIX_RE, re.IGNORECASE)
+HONORIFIC_TOKEN = re.compile(r'^\s*[dm][rs]s?[.,]?\s*$', re.IGNORECASE)
+NICKNAME_TOKEN = re.compile(r'^["(].*[")]$')
+
+MIXED_CASE = re.compile(r'[A-Z][a-z]')
+SCOTTISH = re.compile(r'(?i)\b(?P<mc>ma?c)(?!hin)(?P<first_letter>\w)\w+')
+POSSESSIVE = re.compile(r"(\w+)'S\b")
+SINGLE_WORD_PAC = re.compile(r'(?i)^\w*PAC$')
+PAC = re.compile(r'(?i)\bpac\b')
+JR_OR_SR = re.compile(r'(?i).*[js]r')
+ONLY_INITIALS = re.compile(r'(?i)[^aeiouy]{2,3}$')
+
+TRAILING_PARENTHETICAL = re.compile(r'\s*\([^)]*\)?\s*$')
+FORMERLY = re.compile(r'(?i)\s* formerly.*$')
+AND_ITS_AFFILIATES = re.compile(r'(?i)\s*and its affiliates$')
+ET_AL = re.compile(r'\bet al\b')
+HYPHEN_PREFIX_END = re.compile(r'(\w{4,}|\s+)$')
+HYPHEN_SUFFIX_EXEMPT = re.compile(r'^([a-zA-Z]|[0-9]+)$')
+PUNCTUATION = re.compile(r'[,.*:;+]*')
+
+FAMILY_NAME_PREFIXES = ('de', 'di', 'du', 'la', 'van', 'von')
+ALLOWED_HONORIFICS = ('mrs', 'mrs.')
+
+ABBREVIATIONS = {
+    'acad': 'Academy', 'assns': 'Associations', 'assn': 'Association', 'cmte': 'Committee',
+    'cltn': 'Coalition', 'inst': 'Institute', 'corp': 'Corporation', 'co': 'Company',
+    'fedn': 'Federation', 'fed': 'Federal', 'fzco': 'Company', 'usa': 'USA', 'us': 'United States',
+    'dept': 'Department', 'assoc': 'Associates', 'natl': 'National', 'nat\'l': 'National',
+    'intl': 'International', 'inc': 'Incorporated', 'llc': 'LLC', 'llp': 'LLP', 'lp': 'LP',
+    'plc': 'PLC', 'ltd': 'Limited', 'univ': 'University', 'colls': 'Colleges', 'coll': 'College',
+    'amer': 'American', 'ed': 'Educational',
+}
+FILLER_WORDS = ['The', 'And', 'Of', 'In', 'For', 'Group']
+STOP_WORDS = dict((x.lower(), None) for x in ABBREVIATIONS.values() + FILLER_WORDS)
+
+
+class Unparseable(Exception):
+    pass
+
+
+def too_long(string):
+    return len(string) > MAX_LENGTH or len(string.split()) > MAX_TOKENS
+
+
+# people
+
+def remove_piece(name, piece):
+    """ Removes every occurrence of piece, and the one whitespace character (if any) before each. """
+    if not piece:
+        return name
+
+    kept = []
+    start = 0
+    found = name.find(piece)
+
+    while found != -1:
+        end = found
+        if found > start and name[found - 1] in ' \t\n\r\f\v':
+            end -= 1
+        kept.append(name[start:end])
+        start = found + len(piece)
+        found = name.find(piece, start)
+
+    if not kept:
+        return name
+
+    kept.append(name[start:])
+    return ''.join(kept)
+
+
+def extract(pattern, name):
+    pieces = []
+    for match in pattern.finditer(name):
+        pieces.append(match.group())
+        name = remove_piece(name, match.group())
+    return name, ' '.join(pieces) if pieces else None
+
+
+def extract_suffix(name):
+    if len(name.strip().split()) > 2:
+        name, suffix = extract(SUFFIX, name)
+        suffix, degree = extract(DEGREE, suffix or '')
+        return name, suffix or None
+    return name, None
+
+
+def reverse_last_first(name):
+    name, suffix = extract_suffix(name)
+    parts = LAST_FIRST_SEPARATOR.split(name)
+    if len(parts) >= 2:
+        parts.reverse()
+    if suffix:
+        parts.append(suffix)
+    return ' '.join(parts)
+
+
+def person_from_tokens(tokens, allow_quoted_nicknames=False):
+    """ Returns a dict of the name's parts. """
+    skipped = ('(',) if allow_quoted_nicknames else ('(', '"')
+    args = [ x.strip() for x in tokens if not x.startswith(skipped) ]
+
+    if len(args) > 2:
+        for i in range(len(args) - 1):
+            if args[i].lower() in FAMILY_NAME_PREFIXES:
+                args[i:i + 2] = [ args[i] + ' ' + args[i + 1] ]
+                break
+
+    name = dict(honorific=None, first='', middle=None, last='', suffix=None, nick=None)
+
+    if args:
+        if HONORIFIC_TOKEN.match(args[-1]):
+            name['honorific'] = args.pop()
+            if name['honorific'][-1] != '.':
+                name['honorific'] += '.'
+        if SUFFIX_TOKEN.match(args[-1]):
+            name['suffix'] = args.pop()
+            if name['suffix'].lower() in ('jr', 'sr'):
+                name['suffix'] += '.'
+        if NICKNAME_TOKEN.match(args[-1]):
+            name['nick'] = args.pop()
+        name['last'] = args.pop()
+
+    if len(args) == 3:
+        name['first'] = args[0]
+        name['middle'] = ' '.join(args[1:3])
+    elif len(args) == 2:
+        name['first'], name['middle'] = args
+        if len(name['middle']) == 1:
+            name['middle'] += '.'
+    elif len(args) == 1:
+        name['first'] = args[0]
+
+    if name['first'] and len(name['first']) == 1:
+        name['first'] += '.'
+
+    return name
+
+
+def uppercase_the_scots(part):
+    match = SCOTTISH.search(part)
+    if match:
+        mc, first_letter = match.group('mc'), match.group('first_letter')
+        return part.replace(mc + first_letter, mc.title() + first_letter.upper())
+    return part
+
+
+def case_person(name):
+    if MIXED_CASE.search(' '.join([ x for x in (name['first'], name['last']) if x ])):
+        return name
+
+    for part in ('honorific', 'nick', 'middle'):
+        name[part] = name[part].title() if name[part] else None
+
+    if name['first']:
+        first = name['first'].title()
+        if ONLY_INITIALS.match(first) and '.' not in first:
+            first = ''.join([ x.upper() + '.' for x in first ])
+        name['first'] = first
+
+    if name['last']:
+        name['last'] = uppercase_the_scots(name['last'].title())
+
+    if name['suffix']:
+        name['suffix'] = name['suffix'].title() if JR_OR_SR.match(name['suffix']) else name['suffix'].upper()
+
+    return name
+
+
+def person_text(name):
+    honorific = name['honorific'] if name['honorific'] and name['honorific'].lower() in ALLOWED_HONORIFICS else None
+    parts = [ honorific, name['first'], name['middle'], name['nick'],
+            name['last'] + (',' if name['suffix'] else ''), name['suffix'] ]
+    return unicode(' '.join([ x.strip() for x in parts if x ]))
+
+
+def person_record(name):
+    return PersonRecord(name['first'], name['middle'], name['last'], name['suffix'],
+            name['honorific'], name['nick'], person_text(name), True)
+
+
+def parse_one_token(string):
+    try:
+        name = person_from_tokens([ string ])
+    except Exception:
+        raise Unparseable()
+    return case_person(name)
+
+
+def parse_individual_name(string):
+    if ' ' not in string:
+        return parse_one_token(string)
+
+    try:
+        name = PARENTHETICAL_PADDING.sub('(\1)', string)
+        name = TRAILING_AND_MRS.sub('', name)
+
+        name, suffix = extract_suffix(name)
+        name, honorific = extract(HONORIFIC, name)
+        if suffix:
+            suffix = suffix.replace('.', '')
+        name, junk = extract(JUNK_NUMBERS, name)
+        name, nick = extract(QUOTED_NICKNAME, name)
+        name = TRAILING_NON_ALPHANUMERIC.sub('', name)
+
+        if honorific and not honorific.endswith('.'):
+            honorific += '.'
+
+        name = reverse_last_first(name)
+        name = ' '.join([ x.strip() for x in [name, nick, suffix, honorific] if x ])
+        name = person_from_tokens(WHITESPACE.split(name), allow_quoted_nicknames=True)
+    except Exception:
+        raise Unparseable()
+
+    if not name['last']:
+        raise Unparseable()
+    return case_person(name)
+
+
+def politician_name(string):
+    """ Returns a dict of parts, or a list of two of them for running mates. """
+    if '&' in string or '/' in string:
+        mates = [ politician_name(x) for x in RUNNING_MATES_SEPARATOR.split(string) ]
+        if len(mates) != 2:
+            raise Unparseable()
+        return mates
+
+    name = reverse_last_first(string)
+    return person_from_tokens([ x for x in WHITESPACE.split(name) if x ])
+
+
+def parse_politician_name(string):
+    if ' ' not in string:
+        return parse_one_token(string)
+
+    try:
+        name = PARTY.sub('', string) if '(' in string else string
+        name = politician_name(name)
+    except Exception:
+        raise Unparseable()
+
+    if isinstance(name, list):
+        return [ case_person(x) for x in name ]
+    if not name['last']:
+        raise Unparseable()
+    return case_person(name)
+
+
+def parse_person(parse, string):
+    if not string or too_long(string):
+        return PersonRecord(None, None, None, None, None, None, string, False)
+
+    try:
+        name = parse(string)
+    except Unparseable:
+        return PersonRecord(None, None, None, None, None, None, string, False)
+
+    if isinstance(name, list):
+        return PersonRecord(None, None, None, None, None, None, u' & '.join([ person_text(x) for x in name ]), True)
+    return person_record(name)
+
+
+def parse_individual(string):
+    return parse_person(parse_individual_name, string)
+
+
+def parse_politician(string):
+    return parse_person(parse_politician_name, string)
+
+
+# organizations
+
+def without_extra_phrases(name):
+    name = TRAILING_PARENTHETICAL.sub('', name)
+    name = FORMERLY.sub('', name)
+    name = AND_ITS_AFFILIATES.sub('', name)
+    name = ET_AL.sub('', name)
+
+    if '-' in name:
+        before, after = name.rsplit('-', 1)
+        if len(after) < len(before) and HYPHEN_PREFIX_END.search(before) and not HYPHEN_SUFFIX_EXEMPT.match(after):
+            name = before.strip()
+
+    return name
+
+
+def replace_phrases(words, phrases):
+    """ Replaces the longest phrase starting at each word, left to right; None drops it. """
+    longest = max(len(x.split()) for x in phrases)
+    lowered = [ x.lower() for x in words ]
+    result = []
+    i = 0
+
+    while i < len(words):
+        for length in range(min(longest, len(words) - i), 0, -1):
+            phrase = ' '.join(lowered[i:i + length])
+            if phrase in phrases:
+                if phrases[phrase] is not None:
+                    result.append(phrases[phrase])
+                i += length
+                break
+        else:
+            result.append(words[i])
+            i += 1
+
+    return result
+
+
+def expand(name):
+    punctuated = without_extra_phrases(name).replace('/', ' ')
+    return ' '.join(replace_phrases(PUNCTUATION.sub('', punctuated).split(), ABBREVIATIONS))
+
+
+def kernel(name):
+    return ' '.join(replace_phrases(expand(name).split(), STOP_WORDS))
+
+
+def case_organization(name):
+    if MIXED_CASE.search(without_extra_phrases(name)):
+        return name
+
+    name = uppercase_the_scots(name.title())
+    if SINGLE_WORD_PAC.match(name):
+        name = name.upper()
+    else:
+        name = PAC.sub('PAC', name)
+    name = uppercase_the_scots(name)
+    return POSSESSIVE.sub("\\1's", name)
+
+
+def parse_organization(string):
+    if not string or too_long(string):
+        return OrganizationRecord(string, None, None, False)
+
+    name = case_organization(string.strip())
+    return OrganizationRecord(unicode(name), expand(name), kernel(name), True)
@@ -0,0 +1,141 @@
+from collections import defaultdict
+import random
+import threading
+from timeit import default_timer as timer
+from exception import UnparseableNameException
+
+
+def length_bucket(string):
+    """ Inputs are grouped by length in powers of two: '0', '1', '2-3', '4-7', '8-15' and so on. """
+    try:
+        length = len(string)
+    except TypeError:
+        return 'n/a'
+
+    if length < 2:
+        return str(length)
+
+    low = 1 << (length.bit_length() - 1)
+    return '{0}-{1}'.format(low, 2 * low - 1)
+
+
+def latency_bucket(seconds):
+    """ Latencies are counted in powers of two microseconds: '<1us', '<2us', '<4us' and so on. """
+    microseconds = int(seconds * 1e6)
+    return '<{0}us'.format(1 << microseconds.bit_length())
+
+
+class Telemetry(object):
+    """
+    Keeps count of how parsing goes in bulk, without logging every input: for
+    each cleaver class, how many inputs were parsed, empty or unparseable,
+    why the unparseable ones failed (the exception that stopped the parse, or
+    a missing last name), a random sample of the failures, and how long
+    parsing took, bucketed by input length. It's opt-in, like the parse cache:
+
+        BaseNameCleaver.telemetry = Telemetry()
+        ...
+        print BaseNameCleaver.telemetry.snapshot()
+
+    Only actual parses are recorded, so with a parse cache installed, cache
+    hits aren't (the cache's own stats() counts those). Recording takes a
+    lock, so one Telemetry can be shared by cleaver engines in many threads.
+    """
+
+    def __init__(self, sample_size=100, seed=None):
+        self.sample_size = sample_size
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.counts = defaultdict(lambda: defaultdict(int))
+        self.reasons = defaultdict(lambda: defaultdict(int))
+        self.samples = defaultdict(list)
+        self.latencies = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+        self.seconds = defaultdict(lambda: defaultdict(float))
+
+    def build(self, cleaver, string, safe=False):
+        """ Builds string with cleaver (see BaseNameCleaver.build), recording how it went. """
+        started = timer()
+
+        try:
+            result = cleaver.build(string, safe=False)
+        except Exception, e:
+            self.record(type(cleaver).__name__, string, timer() - started, getattr(e, 'reason', None) or type(e).__name__)
+            if safe and isinstance(e, UnparseableNameException):
+                return cleaver.cannot_parse(safe, string=string)
+            raise
+
+        self.record(type(cleaver).__name__, string, timer() - started, None if string else 'empty')
+        return result
+
+    def record(self, cleaver_name, string, seconds, reason):
+        """
+        Records one parse: reason is None for a name that parsed, 'empty' for an
+        empty input, and otherwise why the input couldn't be parsed.
+        """
+        length = length_bucket(string)
+
+        with self.lock:
+            if reason is None:
+                self.counts[cleaver_name]['parsed'] += 1
+            elif reason == 'empty':
+                self.counts[cleaver_name]['empty'] += 1
+            else:
+                self.counts[cleaver_name]['failed'] += 1
+                self.reasons[cleaver_name][reason] += 1
+                self.sample(cleaver_name, (string, reason))
+
+            self.latencies[cleaver_name][length][latency_bucket(seconds)] += 1
+            self.seconds[cleaver_name][length] += seconds
+
+    def sample(self, cleaver_name, failure):
+        """ Keeps a uniform random sample of each cleaver's failures (reservoir sampling). """
+        sample = self.samples[cleaver_name]
+        seen = self.counts[cleaver_name]['failed']
+
+        if len(sample) < self.sample_size:
+            sample.append(failure)
+        else:
+            position = self.random.randrange(seen)
+            if position < self.sample_size:
+                sample[position] = failure
+
+    def snapshot(self):
+        """
+        The figures so far, as plain dicts keyed by cleaver class name:
+
+            {'IndividualNameCleaver': {
+                'parsed': 9650, 'empty': 12, 'failed': 338, 'failure_rate': 0.0338,
+                'reasons': {'missing last name': 301, 'IndexError': 37},
+                'failure_sample': [('mr & mrs', 'missing last name'), ...],
+                'latency': {'8-15': {'count': 5120, 'mean_us': 14.2, 'histogram': {'<16us': 4803, ...}}, ...},
+            }}
+        """
+        with self.lock:
+            snapshot = {}
+
+            for cleaver_name, counts in self.counts.iteritems():
+                total = sum(counts.itervalues())
+                latency = {}
+
+                for length, histogram in self.latencies[cleaver_name].iteritems():
+                    count = sum(histogram.itervalues())
+                    latency[length] = {
+                        'count': count,
+                        'mean_us': self.seconds[cleaver_name][length] / count * 1e6,
+                        'histogram': dict(histogram),
+                    }
+
+                snapshot[cleaver_name] = {
+                    'parsed': counts['parsed'],
+                    'empty': counts['empty'],
+                    'failed': counts['failed'],
+                    'failure_rate': float(counts['failed']) / total if total else 0.0,
+                    'reasons': dict(self.reasons[cleaver_name]),
+                    'failure_sample': list(self.samples[cleaver_name]),
+                    'latency': latency,
+                }
+
+            return snapshot
@@ -1,11 +1,45 @@
 from cleaver import PoliticianNameCleaver, OrganizationNameCleaver, \
-        IndividualNameCleaver, UnparseableNameException
+        IndividualNameCleaver, UnparseableNameException, BaseNameCleaver
+from records import PersonRecord, OrganizationRecord
+import parallel
+from nicknames import nickname_group, are_nickname_equivalent, NicknameIndex, LazyNicknameIndex
+from index import PersonNameIndex, PhoneticPersonNameIndex, OrganizationNameIndex
+import phonetics
+from cache import ParseCache, PersistentParseCache, tables_versions
+from profiling import StageProfiler
+from telemetry import Telemetry, length_bucket, latency_bucket
+import columnar
+import tokens
+import patterns
+from phrases import PhraseMatcher
+from casing import CaseRestorer
+from names import PersonName, OrganizationName, case_restorers_by_class
+import dedupe
+import differential
+import reference
+from lsh import MinHashIndex
+
+import os
+import pickle
+import shutil
+import tempfile
+import codecs
 
 try:
     import unittest2 as unittest
 except ImportError:
     import unittest
 
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class TestPoliticianNameCleaver(unittest.TestCase):
 
@@ -170,6 +204,103 @@ class TestOrganizationNameCleaver(unittest.TestCase):
     def test_handles_empty_names(self):
         self.assertEqual('', str(OrganizationNameCleaver('').parse()))
 
+    def test_derived_forms_follow_the_name(self):
+        name = OrganizationNameCleaver('Massachusetts Inst. of Technology').parse()
+        self.assertEqual('Massachusetts Technology', name.kernel())
+        self.assertIs(name.kernel(), name.kernel())
+
+        name.new('Raytheon Corp.')
+        self.assertEqual('Raytheon Corporation', name.expand())
+        self.assertEqual('Raytheon', name.kernel())
+
+    def test_kernel_removes_united_states_as_a_phrase(self):
+        self.assertEqual('Steel', OrganizationNameCleaver('US Steel').parse().kernel())
+        self.assertEqual('Steel', OrganizationNameCleaver('UNITED STATES STEEL').parse().kernel())
+        self.assertEqual('United Statesmen', OrganizationNameCleaver('United Statesmen').parse().kernel())
+        self.assertEqual('United States', OrganizationNameCleaver('United Corp. States').parse().kernel())
+
+    def test_multi_word_abbreviations(self):
+        class UnionName(OrganizationName):
+            __slots__ = ()
+            abbreviations = dict(OrganizationName.abbreviations, **{ 'elec wkrs': 'Electrical Workers' })
+
+        class UnionNameCleaver(OrganizationNameCleaver):
+            object_class = UnionName
+
+        name = UnionNameCleaver('INTL BROTHERHOOD OF ELEC WKRS LOCAL 46').parse()
+        self.assertEqual('International Brotherhood Of Electrical Workers Local 46', name.expand())
+        self.assertEqual('Brotherhood Electrical Workers Local 46', name.kernel())
+        self.assertEqual('Elec Wkrs', OrganizationNameCleaver('Elec Wkrs').parse().expand())
+
+
+class TestLoadedTables(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, filename, text):
+        path = os.path.join(self.directory, filename)
+        with codecs.open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_nicknames_from_file(self):
+        path = self.write('nicknames.txt', u'# comment\n\nAlexander, Alex, Sasha\nJos\xe9, Pepe\n')
+
+        index = NicknameIndex.from_file(path)
+        self.assertTrue(index.are_equivalent('SASHA', 'alexander'))
+        self.assertTrue(index.are_equivalent(u'Jos\xe9', 'Pepe'))
+        self.assertTrue(index.are_equivalent('Bob', 'Robert'))
+        self.assertFalse(NicknameIndex.from_file(path, include_defaults=False).are_equivalent('Bob', 'Robert'))
+
+    def test_lazy_nickname_index(self):
+        index = LazyNicknameIndex(os.path.join(self.directory, 'nicknames.txt'))
+        self.write('nicknames.txt', u'Alexander, Alex, Sasha\n')
+        self.assertTrue(index.are_equivalent('Sasha', 'Alex'))
+
+    def test_abbreviations_from_file(self):
+        path = self.write('abbreviations.tsv', u'# abbreviation\texpansion\nelec wkrs\tElectrical Workers\nwkrs\tWorkers\n')
+
+        class UnionName(OrganizationName):
+            __slots__ = ()
+            abbreviation_files = (path,)
+
+        name = UnionName().new('Intl Brotherhood of Elec Wkrs, Steel Wkrs')
+        self.assertEqual('International Brotherhood of Electrical Workers Steel Workers', name.expand())
+        self.assertEqual('Steel Wkrs', OrganizationName().new('Steel Wkrs').expand())
+
+    def test_malformed_abbreviations(self):
+        class BrokenName(OrganizationName):
+            __slots__ = ()
+            abbreviation_files = (self.write('broken.tsv', u'elec Electric\n'),)
+
+        self.assertRaises(ValueError, BrokenName().new('Elec').expand)
+
+    def test_case_exceptions_from_file(self):
+        path = self.write('spellings.txt', u'# one per line\n\nDeLauro\nAFL-CIO\n')
+
+        class LaborName(OrganizationName):
+            __slots__ = ()
+            case_exception_files = (path,)
+
+        self.assertEqual('AFL-CIO Friends Of DeLauro', LaborName().new('AFL-CIO FRIENDS OF DELAURO').case_name_parts().name)
+        self.assertEqual('Afl-Cio', OrganizationName().new('AFL-CIO').case_name_parts().name)
+
+
+class TestPhraseMatcher(unittest.TestCase):
+
+    def test_longest_match_wins(self):
+        matcher = PhraseMatcher({ 'a': 'A', 'a b': 'AB', 'a b c d': 'ABCD', 'x': None })
+        self.assertEqual(['AB', 'c', 'ABCD', 'A'], matcher.apply('a B c a b c d x a'.split()))
+
+    def test_partial_phrases_are_left_alone(self):
+        matcher = PhraseMatcher({ 'united states': None })
+        self.assertEqual(['United', 'Way', 'States'], matcher.apply(['United', 'Way', 'United', 'States', 'States']))
+        self.assertEqual([], matcher.apply([]))
+
 
 class TestIndividualNameCleaver(unittest.TestCase):
     cleaver = IndividualNameCleaver
@@ -262,12 +393,721 @@ class TestIndividualNameCleaver(unittest.TestCase):
         self.assertIsNone(dutch.middle)
         self.assertEqual('C.A.', dutch.first)
 
+    def test_matched_pieces_are_removed_literally(self):
+        self.assertEqual('Drew Smith', self.cleave_to_str('Dr. Drew Smith'))
+        self.assertEqual('Mary McDonald', self.cleave_to_str('MR MARY MCDONALD M.D.'))
+        self.assertEqual('John W. Noble', IndividualNameCleaver(None).remove_matched_piece('John W. M.D. Noble', 'M.D.'))
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestCompareMany(unittest.TestCase):
+
+    def assertScoresMatch(self, cleaver_class, names):
+        parsed = list(cleaver_class.parse_many(names))
+        candidates = cleaver_class.encode_candidates(parsed)
+
+        for name in parsed:
+            if isinstance(name, basestring):
+                self.assertEqual([0] * len(parsed), list(cleaver_class.compare_many(name, candidates)))
+                continue
+
+            expected = [ (cleaver_class.compare(name, x) or 0) if not isinstance(x, basestring) else 0 for x in parsed ]
+            self.assertEqual(expected, list(cleaver_class.compare_many(name, candidates)))
+
+    def test_people(self):
+        self.assertScoresMatch(IndividualNameCleaver, ['Robert J. Smith', 'SMITH, BOB', 'Smith, J Robert', 'Robert Jones Smith',
+                                                       'Rob Smith', 'Richard Smith', 'Smith', 'mr & mrs', 'Robert K Smith'])
+
+    def test_organizations(self):
+        self.assertScoresMatch(OrganizationNameCleaver, ['Raytheon Corp.', 'RAYTHEON CORPORATION', 'The Raytheon Group',
+                                                         'Akin, Gump et al', 'akin gump', 'Boeing'])
+
+    def test_candidate_lists_are_encoded(self):
+        names = list(IndividualNameCleaver.parse_many(['Nancy Pelosi', 'Nancy D Pelosi', 'Nancy Smith']))
+        self.assertEqual([2, 2, 0], list(IndividualNameCleaver.compare_many(names[0], names)))
+
+
+class TestIndividualNameComparison(unittest.TestCase):
+
+    def compare(self, name1, name2):
+        return IndividualNameCleaver.compare(IndividualNameCleaver(name1).parse(), IndividualNameCleaver(name2).parse())
+
+    def test_different_last_names_score_zero(self):
+        self.assertEqual(0, self.compare('Robert Smith', 'Robert Jones'))
+
+    def test_exact_match(self):
+        self.assertEqual(3, self.compare('SMITH, ROBERT J', 'Robert J Smith'))
+
+    def test_nicknames(self):
+        self.assertAlmostEqual(1.6, self.compare('Robert Smith', 'Bob Smith'))
+        self.assertAlmostEqual(1.7, self.compare('Robert Smith', 'Rob Smith'))
+        self.assertAlmostEqual(1.0, self.compare('Robert Smith', 'Jim Smith'))
+
+    def test_nickname_lookup_is_case_insensitive(self):
+        self.assertTrue(are_nickname_equivalent('BOB', 'robert'))
+        self.assertFalse(are_nickname_equivalent('Bob', 'Jim'))
+        self.assertFalse(are_nickname_equivalent('Zebulon', 'Zeb'))
+        self.assertFalse(are_nickname_equivalent('', None))
+
+    def test_nickname_group(self):
+        self.assertEqual(nickname_group('Jerry'), nickname_group('JERRY'))
+        self.assertEqual(3, len(nickname_group('Jerry'))) # Gerard, Gerald and Jerome
+        self.assertEqual(frozenset(), nickname_group('Zebulon'))
+
+
+class TestNameIndex(unittest.TestCase):
+
+    def test_person_query_ranks_candidates_from_the_last_name_block(self):
+        names = list(IndividualNameCleaver.parse_many(['Robert J Smith', 'Bob Smith', 'Robert Jones', 'SMITH, ROBERT J', 'Zed Smith']))
+        index = PersonNameIndex(names)
+
+        self.assertEqual(4, len(index.candidates(IndividualNameCleaver('Rob Smith').parse())))
+
+        matches = index.query(IndividualNameCleaver('Robert J. Smith').parse(), min_score=1.5)
+        self.assertEqual([(3, names[0]), (3, names[3]), (1.6, names[1])], matches)
+
+    def test_unparsed_names_are_not_indexed(self):
+        index = PersonNameIndex(['mr & mrs', IndividualNameCleaver('Lee').parse()])
+        self.assertEqual(1, len(index.blocks))
+        self.assertEqual([], index.query(IndividualNameCleaver('Robert Jones').parse()))
+
+    def test_organization_query(self):
+        names = list(OrganizationNameCleaver.parse_many(['Raytheon Corp.', 'RAYTHEON COMPANY', 'Massachusetts Inst. of Technology', 'The Group']))
+        index = OrganizationNameIndex(names)
+
+        matches = index.query(OrganizationNameCleaver('Raytheon Corporation').parse(), min_score=3)
+        self.assertEqual([(4, names[0]), (3, names[1])], matches)
+
+        self.assertEqual([(4, names[3])], index.query(OrganizationNameCleaver('the group').parse(), min_score=3))
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = BaseNameCleaver.parse_cache = ParseCache(maxsize=2)
+
+    def tearDown(self):
+        BaseNameCleaver.parse_cache = None
+
+    def test_hits_misses_and_evictions(self):
+        for name in ['Gore, Albert', 'Gore, Albert', 'LEE', 'Gore, Albert', 'Smith, Robert', 'LEE']:
+            self.assertTrue(IndividualNameCleaver(name).parse().last)
+
+        stats = self.cache.stats()
+        self.assertEqual((2, 4, 2, 2), (stats['hits'], stats['misses'], stats['evictions'], stats['size']))
+        self.assertAlmostEqual(2 / 6.0, stats['hit_rate'])
+
+    def test_keyed_by_cleaver_class(self):
+        self.assertEqual('PAC For Engineers', str(OrganizationNameCleaver('PAC FOR ENGINEERS').parse()))
+        self.assertEqual('Pac For Engineers', str(IndividualNameCleaver('PAC FOR ENGINEERS').parse()))
+        self.assertEqual(0, self.cache.hits)
+
+    def test_callers_get_their_own_copy(self):
+        PoliticianNameCleaver('Charles Schumer').parse().plus_metadata('D', 'NY')
+        self.assertEqual('Charles Schumer', str(PoliticianNameCleaver('Charles Schumer').parse()))
+        self.assertEqual(1, self.cache.hits)
+
+        mates = PoliticianNameCleaver('Kasich, John & Taylor, Mary').parse()
+        mates.mate1.first = 'Jim'
+        self.assertEqual('John Kasich & Mary Taylor', str(PoliticianNameCleaver('Kasich, John & Taylor, Mary').parse()))
+
+    def test_failures_are_cached(self):
+        self.assertEqual('mr & mrs', IndividualNameCleaver('mr & mrs').parse(safe=True))
+        with self.assertRaises(UnparseableNameException):
+            IndividualNameCleaver('mr & mrs').parse()
+        self.assertEqual(1, self.cache.hits)
+
+    def test_failures_keep_their_reason(self):
+        for i in range(2):
+            for name, reason in [('mr & mrs', 'IndexError'), ('12 34', 'missing last name')]:
+                with self.assertRaises(UnparseableNameException) as raised:
+                    IndividualNameCleaver(name).parse()
+                self.assertEqual(reason, raised.exception.reason)
+
+        self.assertEqual(2, self.cache.hits)
+
+
+class TestPersistentParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'parses.db')
+
+    def tearDown(self):
+        BaseNameCleaver.parse_cache = None
+        shutil.rmtree(self.directory)
+
+    def parse_all(self, cache, cleaver_class, names):
+        BaseNameCleaver.parse_cache = cache
+        with cache:
+            return [ (type(x), str(x), getattr(x, 'party', None)) for x in cleaver_class.parse_many(names) ]
+
+    def test_results_survive_between_runs(self):
+        names = ['SMITH, ROBERT J', u'Le\xe9 MacDonald Jr', 'Kasich, John & Taylor, Mary', 'Charles Schumer (D)', 'mr & mrs', 'Charles Schumer (D)']
+        uncached = [ (type(x), str(x), getattr(x, 'party', None)) for x in PoliticianNameCleaver.parse_many(names) ]
+
+        first = PersistentParseCache(self.path)
+        self.assertEqual(uncached, self.parse_all(first, PoliticianNameCleaver, names))
+        self.assertEqual((1, 5, 5), (first.hits, first.misses, first.writes))
+
+        second = PersistentParseCache(self.path)
+        self.assertEqual(uncached, self.parse_all(second, PoliticianNameCleaver, names))
+        self.assertEqual((6, 0), (second.hits, second.misses))
+
+        with self.assertRaises(UnparseableNameException):
+            IndividualNameCleaver('mr & mrs').parse()
+
+    def test_failures_keep_their_reason(self):
+        for i in range(2):
+            BaseNameCleaver.parse_cache = cache = PersistentParseCache(self.path, batch_size=1)
+            for name, reason in [('mr & mrs', 'IndexError'), ('12 34', 'missing last name')]:
+                with self.assertRaises(UnparseableNameException) as raised:
+                    IndividualNameCleaver(name).parse()
+                self.assertEqual(reason, raised.exception.reason)
+            self.assertEqual(2 * i, cache.hits)
+            cache.close()
+
+    def test_rebuilt_names_match(self):
+        names = list(OrganizationNameCleaver.parse_many(['Raytheon Corp.']))
+        self.parse_all(PersistentParseCache(self.path), OrganizationNameCleaver, ['Raytheon Corp.'])
+
+        BaseNameCleaver.parse_cache = cache = PersistentParseCache(self.path)
+        rebuilt = OrganizationNameCleaver('Raytheon Corp.').parse()
+        self.assertEqual(1, cache.hits)
+        self.assertEqual((names[0].name, 'Raytheon'), (rebuilt.name, rebuilt.kernel()))
+        self.assertIs(str, type(rebuilt.name))
+
+    def test_keyed_by_rules_version(self):
+        self.parse_all(PersistentParseCache(self.path, version='old'), IndividualNameCleaver, ['Gore, Albert', 'LEE'])
+
+        cache = PersistentParseCache(self.path, version='new')
+        self.parse_all(cache, IndividualNameCleaver, ['Gore, Albert'])
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(2, cache.prune())
+        self.assertEqual(1, len(cache))
+
+    def test_keyed_by_tables(self):
+        spellings = os.path.join(self.directory, 'spellings.txt')
+
+        class DelegationName(PersonName):
+            __slots__ = ()
+            case_exception_files = (spellings,)
+
+        class DelegationNameCleaver(IndividualNameCleaver):
+            object_class = DelegationName
+
+        for spelling, expected in [(u'DeLauro\n', 'Rosa DeLauro'), (u'DELAURO\n', 'Rosa DELAURO')]:
+            with codecs.open(spellings, 'w', encoding='utf-8') as f:
+                f.write(spelling)
+            # as in a new process, which reads the tables afresh
+            tables_versions.clear()
+            case_restorers_by_class.clear()
+
+            cache = PersistentParseCache(self.path)
+            self.assertEqual([expected], [ x[1] for x in self.parse_all(cache, DelegationNameCleaver, ['DELAURO, ROSA']) ])
+            self.assertEqual(0, cache.hits)
+
+    def test_shared_by_threads(self):
+        import threading
+        names = [ 'Smith, Robert %s' % x for x in 'ABCDEFGHIJ' ] + ['mr & mrs']
+        uncached = [ str(x) for x in IndividualNameCleaver.parse_many(names) ]
+        results, errors = [], []
+
+        def parse_all():
+            try:
+                results.append([ str(x) for x in IndividualNameCleaver.parse_many(names) ])
+            except Exception, e:
+                errors.append(e)
+
+        BaseNameCleaver.parse_cache = cache = PersistentParseCache(self.path, batch_size=3)
+        threads = [ threading.Thread(target=parse_all) for x in range(4) ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual([uncached] * 4, results)
+        self.assertEqual(4 * len(names), cache.hits + cache.misses)
+        self.assertEqual(len(names), len(cache))
+        cache.close()
+
+
+class TestCompactNames(unittest.TestCase):
+
+    def test_names_are_slotted(self):
+        for name in (IndividualNameCleaver('Smith, Robert J').parse(), PoliticianNameCleaver('Gore, Albert').parse(),
+                     OrganizationNameCleaver('Raytheon Corp.').parse()):
+            self.assertFalse(hasattr(name, '__dict__'))
+
+    def test_unset_parts_are_none(self):
+        name = PoliticianNameCleaver('Gore, Albert').parse()
+        self.assertEqual((None, None, None, None, None), (name.middle, name.suffix, name.nick, name.party, name.state))
+
+    def test_names_pickle(self):
+        name = PoliticianNameCleaver('Smith, Robert J Jr').parse().plus_metadata('D', 'NY')
+        org = OrganizationNameCleaver('Raytheon Corp.').parse()
+
+        for protocol in (0, pickle.HIGHEST_PROTOCOL):
+            self.assertEqual('Robert J. Smith, Jr. (D-NY)', str(pickle.loads(pickle.dumps(name, protocol))))
+            self.assertEqual('Raytheon', pickle.loads(pickle.dumps(org, protocol)).kernel())
+
+    def test_copy(self):
+        name = IndividualNameCleaver('Smith, Robert J').parse()
+        duplicate = name.copy()
+        duplicate.first = 'Bob'
+        self.assertEqual(('Robert', 'J.', 'Smith'), (name.first, name.middle, name.last))
+        self.assertEqual(('Bob', 'J.', 'Smith'), (duplicate.first, duplicate.middle, duplicate.last))
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def test_records_stages_and_rule_matches(self):
+        with StageProfiler(IndividualNameCleaver) as profiler:
+            self.assertEqual('Frederick A. "Tripp" Baird, III', str(IndividualNameCleaver('Baird, Mr Frederick A "Tripp" III').parse()))
+            IndividualNameCleaver('Robert Smith').parse()
+
+        stats = profiler.stats()
+        # 'Robert Smith' is already clean, so only the first name goes through the stages
+        self.assertEqual(2, stats['stages']['parse_clean_name']['calls'])
+        self.assertEqual(1, stats['stages']['pre_process']['calls'])
+        self.assertEqual(2, stats['stages']['extract_suffix']['calls'])
+        self.assertEqual(1, stats['stages']['case_name_parts']['calls'])
+        self.assertEqual({'suffix': 1, 'honorific': 1, 'quoted_nickname': 1}, stats['rule_matches'])
+        self.assertIn('separate_affixes', profiler.report())
+
+    def test_uninstalls_cleanly(self):
+        original = PoliticianNameCleaver.__dict__['convert_name_to_obj']
+
+        with StageProfiler(PoliticianNameCleaver) as profiler:
+            self.assertIn('pre_process', PoliticianNameCleaver.__dict__)
+            self.assertIn('new_from_tokens', PoliticianNameCleaver.object_class.__dict__)
+            PoliticianNameCleaver('Gore, Albert').parse()
+
+        self.assertIs(original, PoliticianNameCleaver.__dict__['convert_name_to_obj'])
+        self.assertNotIn('pre_process', PoliticianNameCleaver.__dict__)
+        self.assertNotIn('new_from_tokens', PoliticianNameCleaver.object_class.__dict__)
+
+        PoliticianNameCleaver('Gore, Albert').parse()
+        self.assertEqual(1, profiler.stats()['stages']['convert_name_to_obj']['calls'])
+
+
+class TestTelemetry(unittest.TestCase):
+
+    def setUp(self):
+        self.telemetry = BaseNameCleaver.telemetry = Telemetry(sample_size=2, seed=0)
+
+    def tearDown(self):
+        BaseNameCleaver.telemetry = None
+
+    def test_counts_outcomes_and_reasons(self):
+        names = ['SMITH, ROBERT J', 'mr & mrs', '', 'Nancy Pelosi', 'Dr. ,', '12 34']
+        self.assertEqual(['Robert J. Smith', 'mr & mrs', '', 'Nancy Pelosi', 'Dr. ,', '12 34'], [ str(x) for x in IndividualNameCleaver.parse_many(names) ])
+        OrganizationNameCleaver('Raytheon Corp.').parse()
+
+        snapshot = self.telemetry.snapshot()
+        people = snapshot['IndividualNameCleaver']
+        self.assertEqual((2, 1, 3), (people['parsed'], people['empty'], people['failed']))
+        self.assertEqual(0.5, people['failure_rate'])
+        self.assertEqual({'missing last name': 2, 'IndexError': 1}, people['reasons'])
+        self.assertEqual(2, len(people['failure_sample']))
+        self.assertEqual(6, sum(x['count'] for x in people['latency'].values()))
+        self.assertEqual(3, sum(people['latency']['8-15']['histogram'].values()))
+        self.assertEqual(1, snapshot['OrganizationNameCleaver']['parsed'])
+
+    def test_unsafe_parse_still_raises(self):
+        with self.assertRaises(UnparseableNameException) as raised:
+            IndividualNameCleaver('12 34').parse()
+        self.assertEqual('missing last name', raised.exception.reason)
+        self.assertEqual({'missing last name': 1}, self.telemetry.snapshot()['IndividualNameCleaver']['reasons'])
+
+    def test_engines_are_recorded(self):
+        PoliticianNameCleaver.engine().parse('Gore, Albert')
+        self.assertEqual(1, self.telemetry.snapshot()['PoliticianNameCleaver']['parsed'])
+
+    def test_buckets(self):
+        self.assertEqual(['0', '1', '2-3', '8-15', 'n/a'], [ length_bucket(x) for x in ('', 'a', 'abc', 'a' * 15, None) ])
+        self.assertEqual(['<1us', '<2us', '<16us'], [ latency_bucket(x) for x in (0.0000001, 0.000001, 0.00001) ])
+
+
+class TestDifferential(unittest.TestCase):
+
+    people = ['SMITH, ROBERT J', 'Baird, Mr Frederick A "Tripp" III', 'mr & mrs', '"Bob"', 'De Kuyper, John',
+            'MACDONALD, ANGUS MD', 'Nancy Pelosi', '', 'x ' * 200, 'Kasich, John & Taylor, Mary', 'Franken, Al (D)']
+    organizations = ['RAYTHEON CORP.', 'The Walsh Group', 'NANCY PELOSI LEADERSHIP PAC', 'Wal-Mart Stores - DC',
+            'PHOENIX WOMEN\'S HEALTH CENTER', 'Acme (formerly Ajax)', '']
+
+    def test_cleavers_match_the_reference(self):
+        for cleaver_class, names in ((IndividualNameCleaver, self.people), (PoliticianNameCleaver, self.people),
+                (OrganizationNameCleaver, self.organizations)):
+            report = differential.compare(cleaver_class, names)
+            self.assertTrue(report.ok, report.summary())
+            self.assertEqual(len(names), report.checked)
+
+    def test_reports_divergences(self):
+        class ShowsEveryHonorific(PersonName):
+            allowed_honorifics = ['mrs', 'mrs.', 'mr.', 'dr.']
+
+        class Divergent(IndividualNameCleaver):
+            object_class = ShowsEveryHonorific
+
+        report = differential.compare(Divergent, self.people, max_examples=1)
+        self.assertEqual(1, report.diverged)
+        self.assertEqual('Baird, Mr Frederick A "Tripp" III', report.examples[0].input)
+        self.assertEqual(u'Frederick A. "Tripp" Baird, III', report.examples[0].expected.cleaned)
+        self.assertEqual(u'Mr. Frederick A. "Tripp" Baird, III', report.examples[0].actual.cleaned)
+
+    def test_only_stock_cleavers_have_a_reference(self):
+        self.assertIs(reference.parse_organization, differential.reference_for(OrganizationNameCleaver))
+        with self.assertRaises(ValueError):
+            differential.reference_for(BaseNameCleaver)
+
+
+class TestColumnar(unittest.TestCase):
+    names = ['SMITH, ROBERT J', None, 'Gore, Albert', 'SMITH, ROBERT J', 'mr & mrs']
+
+    def test_factorize(self):
+        self.assertEqual(([0, -1, 1, 0, 2], ['SMITH, ROBERT J', 'Gore, Albert', 'mr & mrs']), columnar.factorize(self.names))
+
+    def test_clean_values(self):
+        columns = columnar.clean_values(IndividualNameCleaver, self.names)
+
+        self.assertEqual(['Robert', None, 'Albert', 'Robert', None], columns['first'])
+        self.assertEqual(['Smith', None, 'Gore', 'Smith', None], columns['last'])
+        self.assertEqual(['Robert J. Smith', None, 'Albert Gore', 'Robert J. Smith', 'mr & mrs'], columns['cleaned'])
+        self.assertEqual([True, None, True, True, False], columns['ok'])
+        self.assertEqual(set(PersonRecord._fields), set(columns))
+
+    def test_clean_organization_values(self):
+        columns = columnar.clean_values(OrganizationNameCleaver, ['Raytheon Corp.', 'Raytheon Corp.'])
+        self.assertEqual(['Raytheon Corporation'] * 2, columns['expanded'])
+        self.assertEqual(['Raytheon'] * 2, columns['kernel'])
+
+    @unittest.skipIf(pandas is None, 'pandas is not installed')
+    def test_clean_series(self):
+        series = pandas.Series(self.names, index=[10, 11, 12, 13, 14])
+        frame = columnar.clean_series(IndividualNameCleaver, series)
+
+        self.assertEqual([10, 11, 12, 13, 14], list(frame.index))
+        self.assertEqual(['Smith', None, 'Gore', 'Smith', None], list(frame['last']))
+
+
+class TestPhonetics(unittest.TestCase):
+
+    def test_soundex(self):
+        self.assertEqual(['R163', 'R163', 'A261', 'T522', 'P236', 'P420', ''],
+                         [phonetics.soundex(x) for x in ['Robert', 'Rupert', 'Ashcraft', 'Tymczak', 'Pfister', 'pelosi', '123']])
+
+    def test_metaphone(self):
+        self.assertEqual(['PLS', 'PLS', 'SM0', 'SM0', 'NT', 'NT', 'K0RN', 'K0RN', 'HKS', 'MLR'],
+                         [phonetics.metaphone(x) for x in ['Pelosi', 'Peloci', 'Smith', 'SMYTH', 'Knight', 'Night',
+                                                           'Catherine', 'Kathryn', 'Hughes', u'M\xfcller']])
+        self.assertEqual('MKTNLT', phonetics.metaphone("MacDonald", max_length=None))
+
+    def test_encode_many(self):
+        self.assertEqual(['P420', None, 'P420'], phonetics.encode_many(['Pelosi', None, 'Peloci'], 'soundex'))
+
+    def test_phonetic_keys_follow_the_name(self):
+        name = IndividualNameCleaver('Nancy Pelosi').parse()
+        self.assertEqual('PLS', name.phonetic_key())
+        self.assertEqual('N520', name.phonetic_key('first', 'soundex'))
+        self.assertEqual(None, name.phonetic_key('middle'))
+
+        name.last = 'Smith'
+        self.assertEqual('SM0', name.phonetic_key())
+        self.assertEqual('PLS', pickle.loads(pickle.dumps(IndividualNameCleaver('Nancy Peloci').parse())).phonetic_key())
+
+    def test_phonetic_blocking(self):
+        names = list(IndividualNameCleaver.parse_many(['Nancy Pelosi', 'Nancy Peloci', 'Nancy Smith', 'Nancy D. Pelosi']))
+        index = PhoneticPersonNameIndex(names)
+        self.assertEqual([(2, 'Nancy Pelosi'), (2, 'Nancy D. Pelosi'), (1.5, 'Nancy Peloci')], [(score, str(x)) for score, x in index.query(names[0], min_score=1.5)])
+        self.assertEqual([0, 0, 2, 0], dedupe.cluster(names, PhoneticPersonNameIndex, threshold=1.5))
+
+
+class TestDedupe(unittest.TestCase):
+
+    def test_union_find(self):
+        sets = dedupe.UnionFind(5)
+        self.assertTrue(sets.union(3, 4))
+        self.assertTrue(sets.union(4, 1))
+        self.assertFalse(sets.union(3, 1))
+        self.assertEqual([0, 1, 2, 1, 1], [sets.find(x) for x in range(5)])
+
+    def test_cluster_people(self):
+        names = list(IndividualNameCleaver.parse_many(['SMITH, ROBERT J', 'Robert Jones', 'Bob J Smith', 'mr & mrs',
+                                                       'Robert J. Smith', 'Zed Smith', 'JONES, BOB']))
+        self.assertEqual([0, 1, 0, 3, 0, 5, 1], dedupe.cluster(names, threshold=1.6))
+
+    def test_oversized_blocks_are_refined(self):
+        names = list(IndividualNameCleaver.parse_many(['Robert Smith', 'Zed Smith', 'Bob Smith', 'Zed Smith', 'Ann Smith']))
+        self.assertEqual([0, 1, 0, 1, 4], dedupe.cluster(names, threshold=1.6, max_block_size=2))
+
+    def test_degenerate_blocks_are_bounded(self):
+        # 300 different first names starting with J, all Smiths: refining on the initial doesn't split them up
+        firsts = [ 'J' + a + b + c for a in 'aeiou' for b in 'bcdfghklmnprstvz' for c in 'aeiouy' ][:300]
+        names = list(IndividualNameCleaver.parse_many([ '%s Smith' % x for x in firsts ] + ['Jaba Smith', 'JABA SMITH']))
+        compared = []
+
+        class CountingIndex(PersonNameIndex):
+            def score(self, name, candidate):
+                compared.append((name, candidate))
+                return PersonNameIndex.score(self, name, candidate)
+
+        clusters = dedupe.cluster(names, CountingIndex, threshold=1.6, max_block_size=10)
+        self.assertTrue(len(compared) <= len(names) * 9)
+        self.assertEqual([0, 0], clusters[-2:])
+
+    def test_cluster_organizations(self):
+        names = list(OrganizationNameCleaver.parse_many(['Raytheon Corp.', 'Health Net Inc', 'RAYTHEON CORPORATION', 'Health Net, Inc.']))
+        self.assertEqual([0, 1, 0, 1], dedupe.cluster(names, OrganizationNameIndex, threshold=3))
+
+
+class TestMinHashIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.names = list(OrganizationNameCleaver.parse_many(['Lockheed Martin Corp', 'Raytheon Co', 'Lockheed-Martin Aeronautics',
+                                                              'LOCKHEED MARTIN', 'The Group', 'Natl Assn of Realtors', 'National Association of Realtors']))
+        self.index = MinHashIndex(self.names + ['unparseable'], num_perm=64, bands=32)
+
+    def test_query(self):
+        matches = self.index.query(OrganizationNameCleaver('Lockheed Martin, Inc.').parse(), min_similarity=0.5)
+        self.assertEqual(['Lockheed Martin Corp', 'Lockheed Martin', 'Lockheed-Martin Aeronautics'], [str(x) for score, x in matches])
+        self.assertEqual([1.0, 1.0], [score for score, x in matches[:2]])
+        self.assertEqual([], self.index.query('unparseable'))
+
+    def test_self_join(self):
+        pairs = sorted((i, j) for i, j, similarity in self.index.self_join(min_similarity=0.5))
+        self.assertEqual([(0, 2), (0, 3), (2, 3), (5, 6)], pairs)
+
+    def test_self_join_with_duplicates(self):
+        names = list(OrganizationNameCleaver.parse_many(['Lockheed Martin Corp'] * 40 + ['Raytheon Co'] * 30 + ['LOCKHEED MARTIN']))
+        index = MinHashIndex(names, num_perm=64, bands=32)
+
+        pairs = [ (i, j) for i, j, similarity in index.self_join(min_similarity=0.5) ]
+        self.assertEqual(len(pairs), len(set(pairs)))
+        self.assertEqual(set((i, j) for i in range(71) for j in range(i + 1, 71) if (i < 40) == (j < 40 or j == 70)), set(pairs))
+
+    def test_bands_must_divide_num_perm(self):
+        self.assertRaises(ValueError, MinHashIndex, num_perm=64, bands=24)
+        self.assertAlmostEqual(0.5, MinHashIndex(num_perm=64, bands=16).threshold)
+
+
+class TestTokenClassifier(unittest.TestCase):
+
+    def test_kinds_agree_with_token_patterns(self):
+        person = PersonName()
+        classify = PersonName.token_classifier.classify
+
+        for token in ['Dr', 'MRS.', 'ms,', 'dss', 'Mr.,', 'JR', 'sr.', 'J.D.', 'Ph.D', 'phd.', 'md', 'III', 'xiv', 'I',
+                      'IVy', '"Bob"', '(Bob)', '"Bob', '"', '"a\nb"', 'J', 'J.', 'Jo', 'de', 'VAN', 'Smith', u'\u0130\u0130']:
+            kind = classify(token)
+            self.assertEqual(bool(person.is_an_honorific(token)), kind is tokens.HONORIFIC, token)
+            self.assertEqual(bool(person.is_a_suffix(token)), kind in (tokens.SUFFIX, tokens.DEGREE), token)
+            self.assertEqual(bool(person.is_a_nickname(token)), kind is tokens.NICKNAME, token)
+
+    def test_kinds(self):
+        self.assertEqual([tokens.HONORIFIC, tokens.INITIAL, tokens.INITIAL, tokens.FAMILY_NAME_PREFIX, tokens.WORD,
+                          tokens.DEGREE, tokens.SUFFIX], PersonName.token_classifier.classify_all(['Mr', 'J', 'Q.', 'Van', 'Buren', 'MD', 'II']))
+
+    def test_seen_tokens_are_forgotten_past_maxsize(self):
+        classifier = tokens.TokenClassifier(maxsize=2)
+        for token in ['a', 'b', 'c']:
+            classifier.classify(token)
+        self.assertEqual(1, len(classifier.seen))
+
+    def test_affix_gates(self):
+        self.assertTrue(tokens.may_contain_honorific('SMITH,MR JOHN'))
+        self.assertFalse(tokens.may_contain_honorific('JOHN SMITH'))
+        self.assertTrue(tokens.may_contain_junk_numbers('JOHN SMITH 1234'))
+        self.assertFalse(tokens.may_contain_junk_numbers('JOHN SMITH 1'))
+        self.assertFalse(tokens.may_contain_nickname('JOHN (JACK) SMITH'))
+
+
+class TestParseMany(unittest.TestCase):
+
+    def test_results_come_back_in_input_order(self):
+        names = IndividualNameCleaver.parse_many(['SMITH, ROBERT J', 'Mr T Boone Pickens', '', 'LEE'])
+        self.assertEqual(['Robert J. Smith', 'T. Boone Pickens', '', 'Lee'], [str(x) for x in names])
+
+    def test_each_cleaver_type(self):
+        self.assertEqual(['Albert Gore', 'John Kasich & Mary Taylor'],
+                [str(x) for x in PoliticianNameCleaver.parse_many(['Gore, Albert', 'Kasich, John & Taylor, Mary'])])
+        self.assertEqual(['Nancy Pelosi Leadership PAC', 'Pacific Trust'],
+                [str(x) for x in OrganizationNameCleaver.parse_many(['NANCY PELOSI LEADERSHIP PAC', 'PACIFIC TRUST'])])
+
+    def test_is_lazy(self):
+        names = IndividualNameCleaver.parse_many(iter(['Gore, Albert', 'mr & mrs']), safe=False)
+        self.assertEqual('Albert Gore', str(next(names)))
+        with self.assertRaises(UnparseableNameException):
+            next(names)
+
+    def test_safe_by_default(self):
+        self.assertEqual(['mr & mrs'], list(IndividualNameCleaver.parse_many(['mr & mrs'])))
+
+
+class TestFastPath(unittest.TestCase):
+
+    def assertSameAsFullParse(self, cleaver_class, names):
+        class FullParse(cleaver_class):
+            fast_path = False
+
+        for name in names:
+            fast, full = cleaver_class(name).parse(safe=True), FullParse(name).parse(safe=True)
+            self.assertEqual(type(fast), type(full))
+            self.assertEqual(str(fast), str(full))
+            if isinstance(full, PersonName):
+                self.assertEqual([ full.first, full.middle, full.last, full.suffix, full.honorific, full.nick ],
+                        [ fast.first, fast.middle, fast.last, fast.suffix, fast.honorific, fast.nick ])
+
+    def test_clean_people(self):
+        self.assertEqual('John Q. Smith', str(IndividualNameCleaver(None).parse_clean_name('John Q Smith')))
+        self.assertEqual('Nancy Pelosi', str(PoliticianNameCleaver(None).parse_clean_name('Nancy Pelosi')))
+
+    def test_leaves_anything_else_to_the_full_parse(self):
+        for name in ('Van Smith', 'Van J Smith', 'John Jr', 'Mr Smith', 'John Xi', 'JOHN SMITH', 'Smith, John', 'John Smith ', 'John Smith\n'):
+            self.assertIsNone(IndividualNameCleaver(None).parse_clean_name(name), name)
+
+        for name in ('ACME INC', 'Acme Widgets - DC', 'Acme (formerly Ajax)', 'Acme et al'):
+            self.assertIsNone(OrganizationNameCleaver(None).parse_clean_name(name), name)
+
+    def test_same_as_full_parse(self):
+        people = ['John Smith', 'John Q. Smith', 'John Q Smith', 'De Kuyper', 'La Da Smith', 'John I Smith', 'John Ii',
+                'Jane Mrs', 'John Md', 'Mc Donald', 'John Smith\n', u'Jos\xe9 Smith', 'Al Z Vix']
+        self.assertSameAsFullParse(IndividualNameCleaver, people)
+        self.assertSameAsFullParse(PoliticianNameCleaver, people)
+        self.assertSameAsFullParse(OrganizationNameCleaver, ['Acme Widget Co', ' Acme Widget Co ', "Bob's Pac", 'Wal-Mart',
+                'The Acme Group and its affiliates', 'Mcdonald Brothers'])
+
+
+class TestLimits(unittest.TestCase):
+
+    def test_too_long_to_parse(self):
+        memo = 'Smith, John ' + 'x' * 2000
+        self.assertEqual(memo, IndividualNameCleaver(memo).parse(safe=True))
+        with self.assertRaises(UnparseableNameException) as raised:
+            OrganizationNameCleaver('Acme ' * 101).parse()
+        self.assertEqual('too long', raised.exception.reason)
+
+    def test_limits_are_configurable(self):
+        class Unlimited(IndividualNameCleaver):
+            max_length = max_tokens = None
+
+        self.assertEqual('John Smith', str(Unlimited('Smith,' + ' ' * 2000 + 'John').parse()))
+        self.assertTrue(IndividualNameCleaver(None).too_long('a ' * 101))
+        self.assertFalse(Unlimited(None).too_long('a ' * 101))
+
+    def test_long_inputs_arent_cached(self):
+        memo = 'Smith, John ' + 'x ' * 150
+        BaseNameCleaver.parse_cache = cache = ParseCache()
+        try:
+            self.assertEqual(memo, IndividualNameCleaver(memo).parse(safe=True))
+            self.assertEqual((0, 0), (len(cache), cache.misses))
+
+            IndividualNameCleaver.max_length = IndividualNameCleaver.max_tokens = None
+            self.assertEqual('Smith', IndividualNameCleaver(memo).parse().last)
+            self.assertEqual((1, 1), (len(cache), cache.misses))
+        finally:
+            BaseNameCleaver.parse_cache = None
+            del IndividualNameCleaver.max_length, IndividualNameCleaver.max_tokens
+
+    def test_parentheticals_only_searched_where_they_can_match(self):
+        self.assertEqual('Smith (D ) x(', patterns.sub_parentheticals(patterns.PARENTHETICAL_PADDING, '(\\1)', 'Smith ( D ) x('))
+        self.assertEqual('Al (x) Smith', patterns.strip_trailing_parenthetical(patterns.PARTY, 'Al (x) Smith (D) '))
+        self.assertEqual('Acme ((((', patterns.strip_trailing_parenthetical(patterns.PARTY, 'Acme (((('))
+        self.assertEqual('Acme (a) b', patterns.strip_trailing_parenthetical(patterns.TRAILING_PARENTHETICAL, 'Acme (a) b (c'))
+
+
+class TestEngine(unittest.TestCase):
+
+    def test_parses_like_a_cleaver(self):
+        engine = IndividualNameCleaver.engine()
+        names = ['SMITH, ROBERT J', 'Mr T Boone Pickens', 'Nancy Pelosi', '', 'LEE']
+
+        self.assertEqual([ str(IndividualNameCleaver(x).parse()) for x in names ], [ str(engine.parse(x)) for x in names ])
+        self.assertEqual('John Kasich & Mary Taylor', str(PoliticianNameCleaver.engine()('Kasich, John & Taylor, Mary')))
+        self.assertEqual(['Raytheon Corp.', 'The Walsh Group'], [ str(x) for x in OrganizationNameCleaver.engine().parse_many(['RAYTHEON CORP.', 'The Walsh Group']) ])
+
+    def test_unparseable(self):
+        engine = IndividualNameCleaver.engine()
+        self.assertEqual('mr & mrs', engine.parse('mr & mrs', safe=True))
+        with self.assertRaises(UnparseableNameException):
+            engine.parse('mr & mrs')
+
+    def test_building_leaves_the_cleaver_alone(self):
+        cleaver = PoliticianNameCleaver('Gore, Albert')
+        self.assertEqual('Al Franken', str(cleaver.build('Franken, Al (D)')))
+        self.assertEqual(('Gore, Albert', 'Gore, Albert'), (cleaver.name, cleaver.orig_str))
+
+    def test_shared_between_threads(self):
+        import threading
+
+        engine = IndividualNameCleaver.engine()
+        names = ['SMITH, ROBERT J', 'Baird, Mr Frederick A "Tripp" III', 'mr & mrs', 'Nancy Pelosi', 'LEE'] * 200
+        expected = [ str(IndividualNameCleaver(x).parse(safe=True)) for x in names ]
+        results = {}
+
+        def parse_all(thread):
+            results[thread] = [ str(x) for x in engine.parse_many(names) ]
+
+        threads = [ threading.Thread(target=parse_all, args=(x,)) for x in range(4) ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([expected] * 4, [ results[x] for x in range(4) ])
+
+
+class TestParallel(unittest.TestCase):
+
+    def test_records_come_back_in_input_order(self):
+        names = ['SMITH, ROBERT J', 'mr & mrs', 'Gore, Albert', 'LEE', '']
+        records = list(parallel.parse_many(IndividualNameCleaver, names, workers=2, chunk_size=2))
+
+        self.assertEqual(PersonRecord('Robert', 'J.', 'Smith', None, None, None, 'Robert J. Smith', True), records[0])
+        self.assertEqual(PersonRecord(None, None, None, None, None, None, 'mr & mrs', False), records[1])
+        self.assertEqual(['Robert J. Smith', 'mr & mrs', 'Albert Gore', 'Lee', ''], [x.cleaned for x in records])
+        self.assertEqual([True, False, True, True, False], [x.ok for x in records])
+
+    def test_running_mates(self):
+        records = list(parallel.parse_many(PoliticianNameCleaver, ['Kasich, John & Taylor, Mary'], workers=1))
+        self.assertEqual('John Kasich & Mary Taylor', records[0].cleaned)
+        self.assertTrue(records[0].ok)
+
+    def test_organizations(self):
+        records = list(parallel.parse_many(OrganizationNameCleaver, iter(['Raytheon Corp.', 'The Walsh Group']), workers=2, chunk_size=1))
+        self.assertEqual([OrganizationRecord('Raytheon Corp.', 'Raytheon Corporation', 'Raytheon', True),
+                          OrganizationRecord('The Walsh Group', 'The Walsh Group', 'Walsh', True)], records)
+
 
 class TestCapitalization(unittest.TestCase):
 
     def test_overrides_dumb_python_titlecasing_for_apostrophes(self):
         self.assertEqual('Phoenix Women\'s Health Center', str(OrganizationNameCleaver('PHOENIX WOMEN\'S HEALTH CENTER').parse()))
 
+    def test_case_exceptions(self):
+        restorer = CaseRestorer(['DeLauro', 'AFL-CIO', 'LLC'])
+
+        self.assertEqual('Rosa DeLauro, AFL-CIO (LLC)', restorer.restore('ROSA DELAURO, AFL-CIO (LLC)'))
+        self.assertEqual("McDonald's PAC", restorer.restore("MCDONALD'S PAC", scots=True, pac=True, possessives=True))
+        self.assertEqual('Llcs', restorer.restore('LLCS'))
+        self.assertEqual("DeLauro's Leadership PAC", restorer.restore("DELAURO'S LEADERSHIP PAC", scots=True, pac=True, possessives=True))
+        self.assertEqual("DeLauro'S Staff", restorer.restore("DELAURO'S STAFF"))
+        self.assertEqual('AFL-CIO/LLC', restorer.restore('AFL-CIO/LLC'))
+        self.assertEqual('DeLauro-Smith', restorer.restore('DELAURO-SMITH'))
+        self.assertEqual("'DeLauro'", restorer.restore("'DELAURO'"))
+
+    def test_case_exceptions_for_a_person_name_class(self):
+        class DelegationName(PersonName):
+            __slots__ = ()
+            case_exceptions = ('DeLauro', 'DeGette')
+
+        class DelegationNameCleaver(IndividualNameCleaver):
+            object_class = DelegationName
+
+        self.assertEqual('Rosa DeLauro', str(DelegationNameCleaver('DELAURO, ROSA').parse()))
+        self.assertEqual('Rosa Delauro', str(IndividualNameCleaver('DELAURO, ROSA').parse()))
+
 
 class TestOrganizationNameCleaverForIndustries(unittest.TestCase):
 
@@ -317,6 +1157,13 @@ class TestErrors(unittest.TestCase):
         with self.assertRaises(UnparseableNameException):
             IndividualNameCleaver("mr & mrs").parse()
 
+    def test_unparseable_single_word_names(self):
+        with self.assertRaises(UnparseableNameException):
+            IndividualNameCleaver("MRS").parse()
+
+        self.assertEqual('MRS', IndividualNameCleaver('MRS').parse(safe=True))
+        self.assertEqual('JR', PoliticianNameCleaver('JR').parse(safe=True))
+
     # this ought to have a test, but I'm not sure how to break this one.
     #def test_unparseable_organization_name(self):
     #    with self.assertRaises(UnparseableNameException):
@@ -0,0 +1,105 @@
+"""
+Classifies the tokens of a person's name with set lookups instead of regular
+expressions. Each token is looked at once, and the kind it's given answers
+all the questions new_from_tokens used to ask of it with a regex apiece.
+
+Tokens are expected to have been stripped of surrounding whitespace, as they
+are by new_from_tokens. For those, the kinds agree exactly with
+PersonName.is_an_honorific, is_a_suffix and is_a_nickname.
+"""
+import patterns
+
+HONORIFIC = 'honorific'
+SUFFIX = 'suffix'
+DEGREE = 'degree'
+NICKNAME = 'nickname'
+FAMILY_NAME_PREFIX = 'family_name_prefix'
+INITIAL = 'initial'
+WORD = 'word'
+
+
+def spellings(*parts):
+    """ Every concatenation of one choice from each part, e.g. spellings('ab', 'c') == ['ac', 'bc']. """
+    words = [ '' ]
+    for choices in parts:
+        words = [ x + y for x in words for y in choices ]
+    return words
+
+
+# lowercased spelling -> kind, for the kinds with a fixed vocabulary
+HONORIFICS = frozenset(spellings('dm', 'rs', ('', 's'), ('', '.', ',')))
+DEGREES = frozenset(spellings('j', ('', '.'), 'd', ('', '.')) + spellings('m', ('', '.'), 'd', ('', '.'))
+        + spellings(('ph',), ('', '.'), 'd', ('', '.')))
+GENERATIONAL_SUFFIXES = frozenset(spellings('js', 'r', ('', '.')))
+ROMAN_NUMERAL_LETTERS = 'IVXivx'
+
+
+class TokenClassifier(object):
+    """
+    Names reuse the same few thousand tokens over and over, so the kind of
+    each token seen is remembered, up to maxsize tokens (after which we
+    start over).
+    """
+
+    def __init__(self, family_name_prefixes=(), maxsize=50000):
+        self.maxsize = maxsize
+        self.seen = {}
+        self.vocabulary = {}
+
+        for prefix in family_name_prefixes:
+            self.vocabulary[prefix.lower()] = FAMILY_NAME_PREFIX
+        for honorific in HONORIFICS:
+            self.vocabulary[honorific] = HONORIFIC
+        for suffix in GENERATIONAL_SUFFIXES:
+            self.vocabulary[suffix] = SUFFIX
+        for degree in DEGREES:
+            self.vocabulary[degree] = DEGREE
+
+    def classify(self, token):
+        kind = self.seen.get(token)
+
+        if kind is None:
+            kind = self.classify_uncached(token)
+            if len(self.seen) >= self.maxsize:
+                self.seen.clear()
+            self.seen[token] = kind
+
+        return kind
+
+    def classify_uncached(self, token):
+        kind = self.vocabulary.get(token.lower())
+        if kind is not None:
+            return kind
+
+        if len(token) > 1:
+            if not token.strip(ROMAN_NUMERAL_LETTERS):
+                return SUFFIX
+            if token[0] in '"(' and token[-1] in '")' and '\n' not in token:
+                return NICKNAME
+            if len(token) == 2 and token[1] == '.' and token[0].isalpha():
+                return INITIAL
+        elif token.isalpha():
+            return INITIAL
+
+        return WORD
+
+    def classify_all(self, tokens):
+        return [ self.classify(x) for x in tokens ]
+
+
+# Cheap necessary conditions for the affix rules in
+# IndividualNameCleaver.separate_affixes, which work on the whole string
+# rather than on tokens (an honorific can be glued to a comma, say). When
+# one of these is false its rule can't match, and the regex scan is skipped.
+
+def may_contain_honorific(name):
+    lowered = name.lower()
+    return 'mr' in lowered or 'ms' in lowered or 'dr' in lowered or 'ds' in lowered
+
+
+def may_contain_junk_numbers(name):
+    return patterns.DIGIT_PAIR.search(name) is not None
+
+
+def may_contain_nickname(name):
+    return '"' in name
@@ -0,0 +1,149 @@
+"""
+Scoring one name against many at once with NumPy.
+
+The candidates are encoded once into columns of integer codes (last name,
+first name, middle name, their initials, nickname groups; or an
+organization's expanded form, kernel and CRP-style firm name), and scoring
+a query against them is then a handful of array operations rather than a
+call to compare() per candidate. Equal strings get equal codes, so the
+scores are exactly those compare() gives, except that where compare()
+returns None (an organization whose partner list doesn't match) the score
+is 0. Candidates that aren't names of the right kind score 0 too.
+
+numpy is optional; it's only imported by the functions that need it.
+"""
+from names import PersonName, OrganizationName
+
+
+class Vocabulary(object):
+    """ Gives each distinct value a code, in order of first appearance. """
+
+    def __init__(self):
+        self.codes = {}
+
+    def code(self, value):
+        return self.codes.setdefault(value, len(self.codes))
+
+    def lookup(self, value):
+        """ The value's code, or -2 if it hasn't been seen (-1 marks a candidate that isn't a name). """
+        return self.codes.get(value, -2)
+
+
+def initial(value):
+    return value[0] if value else None
+
+
+class PersonFeatures(object):
+    """ The columns compare_people needs, for a list of candidate PersonNames. """
+
+    def __init__(self, names, nickname_index):
+        import numpy
+
+        self.names = list(names)
+        self.nickname_index = nickname_index
+        self.vocabulary = vocabulary = Vocabulary()
+
+        people = [ x for x in self.names if isinstance(x, PersonName) ]
+        is_person = [ isinstance(x, PersonName) for x in self.names ]
+        column = lambda values: numpy.array(values, dtype=numpy.int32)
+
+        self.valid = numpy.array(is_person, dtype=bool)
+        self.last = numpy.full(len(self.names), -1, dtype=numpy.int32)
+        self.first = self.last.copy()
+        self.middle = self.last.copy()
+        self.first_initial = self.last.copy()
+        self.middle_initial = self.last.copy()
+        self.has_first = numpy.zeros(len(self.names), dtype=bool)
+        self.has_middle = self.has_first.copy()
+
+        self.last[self.valid] = column([ vocabulary.code(x.last) for x in people ])
+        self.first[self.valid] = column([ vocabulary.code(x.first) for x in people ])
+        self.middle[self.valid] = column([ vocabulary.code(x.middle) for x in people ])
+        self.first_initial[self.valid] = column([ vocabulary.code(initial(x.first)) for x in people ])
+        self.middle_initial[self.valid] = column([ vocabulary.code(initial(x.middle)) for x in people ])
+        self.has_first[self.valid] = [ bool(x.first) for x in people ]
+        self.has_middle[self.valid] = [ bool(x.middle) for x in people ]
+
+        # each row holds a candidate's nickname group ids, padded with -1
+        groups = [ sorted(nickname_index.group(x.first)) if isinstance(x, PersonName) else [] for x in self.names ]
+        width = max([ len(x) for x in groups ] or [ 0 ])
+        self.nickname_groups = numpy.full((len(self.names), width), -1, dtype=numpy.int32)
+        for row, ids in enumerate(groups):
+            self.nickname_groups[row, :len(ids)] = ids
+
+    def __len__(self):
+        return len(self.names)
+
+
+def compare_people(query, features):
+    """ The scores IndividualNameCleaver.compare would give query against each candidate, as an array. """
+    import numpy
+
+    if not isinstance(query, PersonName):
+        return numpy.zeros(len(features))
+
+    lookup = features.vocabulary.lookup
+    last_matches = features.valid & (features.last == lookup(query.last))
+    score = last_matches.astype(float)
+
+    if query.first:
+        same_first = features.has_first & (features.first == lookup(query.first))
+        different_first = features.has_first & ~same_first
+        score += numpy.where(same_first, 1, 0)
+
+        groups = list(features.nickname_index.group(query.first))
+        if groups:
+            nicknames = different_first & numpy.isin(features.nickname_groups, groups).any(axis=1)
+            score += numpy.where(nicknames, 0.6, 0)
+
+        swapped = different_first & (features.middle == lookup(query.first)) & (features.first == lookup(query.middle))
+        same_initial = different_first & ~swapped & (features.first_initial == lookup(initial(query.first)))
+        score += numpy.where(swapped, 0.8, 0)
+        score += numpy.where(same_initial, 0.1, 0)
+
+    if query.middle:
+        # the middle name only counts for much once first and last already match
+        confident = features.has_middle & (score > 1.1)
+        same_middle = confident & (features.middle == lookup(query.middle))
+        same_middle_initial = confident & ~same_middle & (features.middle_initial == lookup(initial(query.middle)))
+        score += numpy.select([ same_middle, same_middle_initial, confident, features.has_middle ], [ 1, .5, -1.5, .2 ], 0)
+
+    return numpy.where(last_matches, score, 0)
+
+
+class OrganizationFeatures(object):
+    """ The columns compare_organizations needs, for a list of candidate OrganizationNames. """
+
+    def __init__(self, names):
+        import numpy
+
+        self.names = list(names)
+        self.vocabulary = vocabulary = Vocabulary()
+
+        organizations = [ x if isinstance(x, OrganizationName) else None for x in self.names ]
+        column = lambda values: numpy.array(values, dtype=numpy.int32)
+
+        self.valid = numpy.array([ x is not None for x in organizations ], dtype=bool)
+        self.expanded = column([ vocabulary.code(x.expand().lower()) if x else -1 for x in organizations ])
+        self.kernel = column([ vocabulary.code(x.kernel().lower()) if x else -1 for x in organizations ])
+        self.has_comma = numpy.array([ x is not None and ',' in x.expand() for x in organizations ], dtype=bool)
+        self.crp_style = column([ vocabulary.code(x.crp_style_firm_name()) if x else -1 for x in organizations ])
+
+    def __len__(self):
+        return len(self.names)
+
+
+def compare_organizations(query, features):
+    """ The scores OrganizationNameCleaver.compare would give query against each candidate (None as 0), as an array. """
+    import numpy
+
+    if not isinstance(query, OrganizationName):
+        return numpy.zeros(len(features))
+
+    lookup = features.vocabulary.lookup
+    same_expanded = features.expanded == lookup(query.expand().lower())
+    same_kernel = features.kernel == lookup(query.kernel().lower())
+    same_partners = features.crp_style == lookup(str(query).lower())
+
+    score = numpy.select([ same_expanded, same_kernel, features.has_comma & same_partners, features.has_comma ], [ 4, 3, 3, 0 ], 2)
+    return numpy.where(features.valid, score, 0).astype(float)